@@ -0,0 +1,53 @@
+"""
+Compares the per-event cost of marshalling a command's events one call at a
+time with the batch calls, in both array and JSON Lines form.
+
+Run from the repository root with:
+
+    PYTHONPATH=. python benchmarks/bench_batch_marshalling.py
+"""
+import os
+import timeit
+
+# keep the eventz loggers quiet, they read their level on import
+os.environ["LOG_LEVEL"] = "WARNING"
+
+from eventz.codecs.datetime import Datetime  # noqa: E402
+from eventz.marshall import FqnResolver, Marshall  # noqa: E402
+from tests.example.example_aggregate import ExampleUpdated  # noqa: E402
+
+NUMBER = 200
+REPEAT = 5
+
+
+def _per_event_us(func, events: int) -> float:
+    best = min(timeit.repeat(func, number=NUMBER, repeat=REPEAT))
+    return best / NUMBER / events * 1e6
+
+
+if __name__ == "__main__":
+    marshall = Marshall(
+        fqn_resolver=FqnResolver({"tests.*": "tests.example.example_aggregate.*"}),
+        codecs={"codecs.eventz.Datetime": Datetime()},
+    )
+    for count in (1, 10, 100):
+        events = [
+            ExampleUpdated(
+                aggregate_id="a" * 36, param_one=seq, param_two="value"
+            ).sequence(seq)
+            for seq in range(1, count + 1)
+        ]
+        singles = [marshall.to_json(e) for e in events]
+        as_array = marshall.to_json_many(events)
+        as_lines = marshall.to_json_many(events, lines=True)
+        cases = (
+            ("to_json each", lambda: [marshall.to_json(e) for e in events]),
+            ("to_json_many", lambda: marshall.to_json_many(events)),
+            ("to_json_many lines", lambda: marshall.to_json_many(events, lines=True)),
+            ("from_json each", lambda: [marshall.from_json(s) for s in singles]),
+            ("from_json_many", lambda: marshall.from_json_many(as_array)),
+            ("from_json_many lines", lambda: marshall.from_json_many(as_lines)),
+        )
+        print(f"Per event, batches of {count}:")
+        for name, func in cases:
+            print(f"  {name:22} {_per_event_us(func, count):7.2f} us")
@@ -0,0 +1,65 @@
+"""
+Compares the size and encode/decode speed of Marshall's binary format with
+its JSON output, for single events and for a batch sharing one string table.
+
+Run from the repository root with:
+
+    PYTHONPATH=. python benchmarks/bench_binary_format.py
+"""
+import os
+import timeit
+
+# keep the eventz loggers quiet, they read their level on import
+os.environ["LOG_LEVEL"] = "WARNING"
+
+from eventz.codecs.datetime import Datetime  # noqa: E402
+from eventz.marshall import FqnResolver, Marshall  # noqa: E402
+from tests.example.child import Child  # noqa: E402
+from tests.example.children import Children  # noqa: E402
+from tests.example.parent import ParentCreated  # noqa: E402
+
+EVENTS = 100
+NUMBER = 20
+REPEAT = 5
+
+
+def _best_ms(func) -> float:
+    return min(timeit.repeat(func, number=NUMBER, repeat=REPEAT)) / NUMBER * 1000
+
+
+if __name__ == "__main__":
+    marshall = Marshall(
+        fqn_resolver=FqnResolver(
+            {
+                "tests.ParentCreated": "tests.example.parent.ParentCreated",
+                "tests.Children": "tests.example.children.Children",
+                "tests.Child": "tests.example.child.Child",
+            }
+        ),
+        codecs={"codecs.eventz.Datetime": Datetime()},
+    )
+    events = [
+        ParentCreated(
+            aggregate_id=f"{seq:036d}",
+            children=Children(
+                name="Group", items=[Child(name=f"Child {i}") for i in range(5)]
+            ),
+        ).sequence(seq)
+        for seq in range(1, EVENTS + 1)
+    ]
+    json_sizes = sum(len(marshall.to_json_bytes(e)) for e in events)
+    binary_sizes = sum(len(marshall.to_binary(e)) for e in events)
+    print(f"Size of {EVENTS} events encoded one at a time:")
+    print(f"  JSON    {json_sizes:8d} bytes")
+    print(f"  binary  {binary_sizes:8d} bytes")
+    print(f"Size of {EVENTS} events encoded as one batch:")
+    print(f"  JSON    {len(marshall.to_json_bytes(events)):8d} bytes")
+    print(f"  binary  {len(marshall.to_binary(events)):8d} bytes")
+
+    json_bytes = marshall.to_json_bytes(events)
+    binary = marshall.to_binary(events)
+    print(f"Time for a batch of {EVENTS} events:")
+    print(f"  to_json_bytes  {_best_ms(lambda: marshall.to_json_bytes(events)):8.3f} ms")
+    print(f"  to_binary      {_best_ms(lambda: marshall.to_binary(events)):8.3f} ms")
+    print(f"  from_json      {_best_ms(lambda: marshall.from_json(json_bytes)):8.3f} ms")
+    print(f"  from_binary    {_best_ms(lambda: marshall.from_binary(binary)):8.3f} ms")
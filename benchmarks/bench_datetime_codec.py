@@ -0,0 +1,30 @@
+"""
+Compares the Datetime codec's fast path for its own timestamp format with
+the general dateutil parser it falls back to.
+
+Run from the repository root with:
+
+    PYTHONPATH=. python benchmarks/bench_datetime_codec.py
+"""
+import timeit
+
+from dateutil.parser import parse
+
+from eventz.codecs.datetime import Datetime
+
+NUMBER = 10000
+REPEAT = 5
+
+
+def _best_us(func) -> float:
+    return min(timeit.repeat(func, number=NUMBER, repeat=REPEAT)) / NUMBER * 1e6
+
+
+if __name__ == "__main__":
+    codec = Datetime()
+    own_format = {"timestamp": "2020-01-02T03:04:05.123Z"}
+    other_format = {"timestamp": "2020-01-02T04:04:05.123+01:00"}
+    print("Datetime codec deserialise, per timestamp:")
+    print(f"  dateutil parse         {_best_us(lambda: parse(own_format['timestamp'])):7.2f} us")
+    print(f"  fast path              {_best_us(lambda: codec.deserialise(own_format, None)):7.2f} us")
+    print(f"  fallback (other shape) {_best_us(lambda: codec.deserialise(other_format, None)):7.2f} us")
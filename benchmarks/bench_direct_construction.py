@@ -0,0 +1,62 @@
+"""
+Compares the objects per second built by running `__init__` with those built
+by `__from_fields__` for a class opting in to `direct_construction`, on
+their own, when decoded by Marshall and when mutated.
+
+Run from the repository root with:
+
+    PYTHONPATH=. python benchmarks/bench_direct_construction.py
+"""
+import json
+import os
+import timeit
+
+# keep the eventz loggers quiet, they read their level on import
+os.environ["LOG_LEVEL"] = "WARNING"
+
+from eventz.immutable import Immutable  # noqa: E402
+from eventz.marshall import FqnResolver, Marshall  # noqa: E402
+from eventz.value_object import ValueObject  # noqa: E402
+
+OBJECTS = 1000
+NUMBER = 20
+REPEAT = 5
+
+
+class Reading(ValueObject):
+    def __init__(self, sensor: str, value: float, unit: str, sample: int):
+        self.sensor: str = sensor
+        self.value: float = value
+        self.unit: str = unit
+        self.sample: int = sample
+
+
+class DirectReading(Reading):
+    direct_construction: bool = True
+
+
+def _objects_per_second(func) -> float:
+    best = min(timeit.repeat(func, number=NUMBER, repeat=REPEAT))
+    return OBJECTS * NUMBER / best
+
+
+if __name__ == "__main__":
+    marshall = Marshall(fqn_resolver=FqnResolver({"bench.*": "__main__.*"}))
+    fields = [
+        {"sensor": "s1", "value": 1.5, "unit": "C", "sample": i} for i in range(OBJECTS)
+    ]
+    for class_ in (Reading, DirectReading):
+        readings = [class_(**f) for f in fields]
+        document = json.dumps([{"__fqn__": f"bench.{class_.__name__}", **f} for f in fields])
+        if getattr(class_, "direct_construction", False):
+            construct = lambda: [class_.__from_fields__(f) for f in fields]  # noqa: E731
+        else:
+            construct = lambda: [class_(**f) for f in fields]  # noqa: E731
+        cases = (
+            ("construct", construct),
+            ("from_json", lambda: marshall.from_json(document)),
+            ("mutate", lambda: [Immutable.__mutate__(r, "sample", 0) for r in readings]),
+        )
+        print(f"{class_.__name__}:")
+        for name, func in cases:
+            print(f"  {name:10} {_objects_per_second(func):12,.0f} objects/s")
@@ -0,0 +1,87 @@
+"""
+Measures what logging costs on the hot paths when INFO is switched off.
+
+Run from the repository root with:
+
+    PYTHONPATH=. python benchmarks/bench_logging.py
+
+The first section compares an eagerly formatted f-string log call, as the
+hot paths used to make, against the deferred %-style call they make now.
+The second times a serialise/deserialise round trip and an aggregate replay
+with the eventz loggers at WARNING.
+"""
+import logging
+import os
+import timeit
+
+# the eventz loggers read their level on import
+os.environ["LOG_LEVEL"] = "WARNING"
+
+from eventz.codecs.datetime import Datetime  # noqa: E402
+from eventz.marshall import FqnResolver, Marshall  # noqa: E402
+from tests.example.example_aggregate import ExampleCreated, ExampleUpdated  # noqa: E402
+from tests.example.example_builder import ExampleBuilder  # noqa: E402
+
+EVENTS = 1000
+REPEAT = 5
+NUMBER = 10
+
+log = logging.getLogger("eventz.bench")
+log.setLevel(logging.WARNING)
+
+
+def _best_ms(func) -> float:
+    return min(timeit.repeat(func, number=NUMBER, repeat=REPEAT)) / NUMBER * 1000
+
+
+def _make_events():
+    events = [
+        ExampleCreated(aggregate_id="a" * 36, param_one=0, param_two="zero").sequence(1)
+    ]
+    for seq in range(2, EVENTS + 1):
+        events.append(
+            ExampleUpdated(
+                aggregate_id="a" * 36, param_one=seq, param_two=f"value {seq}"
+            ).sequence(seq)
+        )
+    return tuple(events)
+
+
+def bench_log_calls(events) -> None:
+    def eager():
+        for event in events:
+            log.info(f"... Event: {event}")
+
+    def deferred():
+        for event in events:
+            log.info("... Event: %s", event)
+
+    def guarded():
+        verbose = log.isEnabledFor(logging.INFO)
+        for event in events:
+            if verbose:
+                log.info("... Event: %s", event)
+
+    print(f"{EVENTS} disabled log calls with an event payload:")
+    print(f"  eager f-string    {_best_ms(eager):8.3f} ms")
+    print(f"  deferred %-style  {_best_ms(deferred):8.3f} ms")
+    print(f"  level-guarded     {_best_ms(guarded):8.3f} ms")
+
+
+def bench_hot_paths(events) -> None:
+    marshall = Marshall(
+        fqn_resolver=FqnResolver({"tests.*": "tests.example.example_aggregate.*"}),
+        codecs={"codecs.eventz.Datetime": Datetime()},
+    )
+    json_string = marshall.to_json(events)
+    builder = ExampleBuilder()
+    print(f"{EVENTS} events with the eventz loggers at WARNING:")
+    print(f"  Marshall.to_json        {_best_ms(lambda: marshall.to_json(events)):8.3f} ms")
+    print(f"  Marshall.from_json      {_best_ms(lambda: marshall.from_json(json_string)):8.3f} ms")
+    print(f"  AggregateBuilder.create {_best_ms(lambda: builder.create(events)):8.3f} ms")
+
+
+if __name__ == "__main__":
+    events = _make_events()
+    bench_log_calls(events)
+    bench_hot_paths(events)
@@ -0,0 +1,63 @@
+"""
+Compares updating several fields of a value object one `__mutate__` call at a
+time with a single `__mutate_all__`, for a value object built through
+`__init__` and for one opting in to `direct_construction`.
+
+Run from the repository root with:
+
+    PYTHONPATH=. python benchmarks/bench_mutate_all.py
+"""
+import os
+import timeit
+
+# keep the eventz loggers quiet, they read their level on import
+os.environ["LOG_LEVEL"] = "WARNING"
+
+from eventz.immutable import Immutable  # noqa: E402
+from eventz.value_object import ValueObject  # noqa: E402
+
+NUMBER = 20000
+REPEAT = 5
+
+
+class Wide(ValueObject):
+    def __init__(
+        self, field_0, field_1, field_2, field_3, field_4, field_5, field_6, field_7
+    ):
+        self.field_0 = field_0
+        self.field_1 = field_1
+        self.field_2 = field_2
+        self.field_3 = field_3
+        self.field_4 = field_4
+        self.field_5 = field_5
+        self.field_6 = field_6
+        self.field_7 = field_7
+
+
+class DirectWide(Wide):
+    direct_construction: bool = True
+
+
+def _one_at_a_time(entity, updates):
+    for name, value in updates.items():
+        entity = Immutable.__mutate__(entity, name, value)
+    return entity
+
+
+def _best_us(func) -> float:
+    return min(timeit.repeat(func, number=NUMBER, repeat=REPEAT)) / NUMBER * 1e6
+
+
+if __name__ == "__main__":
+    fields = {f"field_{i}": i for i in range(8)}
+    for class_ in (Wide, DirectWide):
+        entity = class_(**fields)
+        print(f"{class_.__name__} (8 fields):")
+        for count in (1, 4, 8):
+            updates = {f"field_{i}": -i for i in range(count)}
+            one_at_a_time = _best_us(lambda: _one_at_a_time(entity, updates))
+            all_at_once = _best_us(lambda: Immutable.__mutate_all__(entity, updates))
+            print(
+                f"  {count:2d} updated: __mutate__ each {one_at_a_time:7.2f} us,"
+                f" __mutate_all__ {all_at_once:7.2f} us"
+            )
@@ -0,0 +1,61 @@
+"""
+Compares the memory held by, and the construction and mutation cost of, a
+value object in the default dict based mode with the same one declared with
+`slotted = True`.
+
+Run from the repository root with:
+
+    PYTHONPATH=. python benchmarks/bench_slotted.py
+"""
+import os
+import timeit
+import tracemalloc
+
+# keep the eventz loggers quiet, they read their level on import
+os.environ["LOG_LEVEL"] = "WARNING"
+
+from eventz.value_object import ValueObject  # noqa: E402
+
+INSTANCES = 100_000
+NUMBER = 100_000
+REPEAT = 5
+
+
+class DictPoint(ValueObject):
+    def __init__(self, x: int, y: int, label: str):
+        self.x: int = x
+        self.y: int = y
+        self.label: str = label
+
+
+class SlottedPoint(ValueObject):
+    slotted: bool = True
+    __fields__ = ("x", "y", "label")
+
+    def __init__(self, x: int, y: int, label: str):
+        self.x: int = x
+        self.y: int = y
+        self.label: str = label
+
+
+def _bytes_per_instance(class_) -> float:
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    instances = [class_(x=i, y=i, label="point") for i in range(INSTANCES)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del instances
+    return (after - before) / INSTANCES
+
+
+def _best_us(func) -> float:
+    return min(timeit.repeat(func, number=NUMBER, repeat=REPEAT)) / NUMBER * 1e6
+
+
+if __name__ == "__main__":
+    for class_ in (DictPoint, SlottedPoint):
+        point = class_(x=1, y=2, label="point")
+        print(f"{class_.__name__}:")
+        print(f"  memory     {_bytes_per_instance(class_):7.1f} bytes per instance")
+        print(f"  construct  {_best_us(lambda: class_(x=1, y=2, label='point')):7.3f} us")
+        print(f"  mutate     {_best_us(lambda: point._mutate('x', 3)):7.3f} us")
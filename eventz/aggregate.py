@@ -10,6 +10,8 @@ class Aggregate(Entity):
     Top-level entity that other services interact with from outside the domain.
     """
 
+    __slots__ = ()
+
     def __init__(self, uuid: Optional[str] = None):
         super().__init__(uuid)
 
@@ -1,11 +1,12 @@
 import logging
 import os
 from abc import ABC, abstractmethod
-from typing import Dict, TypeVar
+from typing import Dict, Iterable, TypeVar
 
 from eventz.aggregate import Aggregate
+from eventz.immutable import get_attributes
 from eventz.messages import Event
-from eventz.protocols import AggregateBuilderProtocol, Events
+from eventz.protocols import AggregateBuilderProtocol
 
 T = TypeVar("T")
 
@@ -14,22 +15,32 @@ log.setLevel(os.getenv("LOG_LEVEL", "INFO"))
 
 
 class AggregateBuilder(ABC, AggregateBuilderProtocol):
-    def create(self, events: Events) -> T:
+    def create(self, events: Iterable[Event]) -> T:
         log.info("AggregateBuilder.create")
         kwargs = {}
         return self._apply_events(kwargs, events)
 
-    def update(self, aggregate: Aggregate, events: Events) -> T:
+    def update(self, aggregate: Aggregate, events: Iterable[Event]) -> T:
         log.info("AggregateBuilder.update")
-        kwargs = vars(aggregate)
+        # copy, as builders are free to modify kwargs in place
+        kwargs = dict(get_attributes(aggregate))
         return self._apply_events(kwargs, events)
 
-    def _apply_events(self, kwargs: Dict, events: Events) -> T:
-        log.info(f"AggregateBuilder._apply_events with initial kwargs={kwargs}")
+    def _apply_events(self, kwargs: Dict, events: Iterable[Event]) -> T:
+        """
+        `events` may be a generator, e.g. from `iter_events`, in which case
+        each event is decoded just before it is applied.
+        """
+        # checked once, as a long replay would otherwise pay for two calls per event
+        verbose = log.isEnabledFor(logging.INFO)
+        if verbose:
+            log.info("AggregateBuilder._apply_events with initial kwargs=%s", kwargs)
         for event in events:
-            log.info(f"... Event: {event}")
+            if verbose:
+                log.info("... Event: %s", event)
             kwargs = self._apply_event(kwargs, event)
-            log.info(f"... Updated kwargs: {kwargs}")
+            if verbose:
+                log.info("... Updated kwargs: %s", kwargs)
         log.info("Creating new aggregate with kwargs.")
         return self._new_aggregate(kwargs)
 
@@ -0,0 +1,76 @@
+import sys
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Optional, Tuple
+
+from eventz.immutable import get_attributes
+from eventz.protocols import AggregateCacheProtocol
+
+
+class AggregateCache(AggregateCacheProtocol):
+    """
+    LRU of built aggregates keyed by aggregate_id, each stored with the __seq__
+    of the last event applied to it. The cache is bounded both by number of
+    entries and, optionally, by an estimate of the aggregates' size in bytes.
+    """
+
+    def __init__(self, max_entries: int = 1024, max_bytes: Optional[int] = None):
+        self._max_entries: int = max_entries
+        self._max_bytes: Optional[int] = max_bytes
+        self._entries: OrderedDict = OrderedDict()
+        self._size_bytes: int = 0
+        self._lock = Lock()
+
+    def get(self, aggregate_id: str) -> Optional[Tuple[Any, int]]:
+        with self._lock:
+            entry = self._entries.get(aggregate_id)
+            if entry is None:
+                return None
+            self._entries.move_to_end(aggregate_id)
+            aggregate, seq, _ = entry
+            return aggregate, seq
+
+    def put(self, aggregate_id: str, aggregate: Any, seq: int) -> None:
+        """
+        Entries only ever move forwards, so a stale build never replaces a newer one.
+        """
+        size = self._estimate_size(aggregate)
+        with self._lock:
+            existing = self._entries.get(aggregate_id)
+            if existing is not None:
+                if existing[1] > seq:
+                    return
+                self._size_bytes -= existing[2]
+            self._entries[aggregate_id] = (aggregate, seq, size)
+            self._entries.move_to_end(aggregate_id)
+            self._size_bytes += size
+            self._evict()
+
+    def discard(self, aggregate_id: str) -> None:
+        with self._lock:
+            entry = self._entries.pop(aggregate_id, None)
+            if entry is not None:
+                self._size_bytes -= entry[2]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def size_bytes(self) -> int:
+        return self._size_bytes
+
+    def _evict(self) -> None:
+        while len(self._entries) > self._max_entries or (
+            self._max_bytes is not None
+            and self._size_bytes > self._max_bytes
+            and len(self._entries) > 1
+        ):
+            _, (_, _, size) = self._entries.popitem(last=False)
+            self._size_bytes -= size
+
+    def _estimate_size(self, aggregate: Any) -> int:
+        size = sys.getsizeof(aggregate)
+        if hasattr(aggregate, "__dict__"):
+            size += sys.getsizeof(vars(aggregate))
+        size += sum(sys.getsizeof(v) for v in get_attributes(aggregate).values())
+        return size
@@ -0,0 +1,194 @@
+"""
+A compact tagged binary encoding of the structures Marshall builds for JSON,
+i.e. dicts with string keys, lists, strings, ints, floats, bools and None.
+
+Every dict key, and every string held under a dunder key such as `__fqn__`
+or `__codec__`, is written once to a string table at the head of the
+document and referred to by index after that. A batch of events encoded
+together therefore shares one table across the whole stream.
+
+Layout: the magic bytes `EVZ`, a format version byte, the string table
+(count, then each string as length and UTF-8 bytes) and a single value.
+Counts, lengths, indexes and ints are varints, ints being zigzag encoded so
+that they are not limited in size.
+"""
+import struct
+from typing import Any, Dict, List, Tuple
+
+from eventz.errors import BinaryFormatError
+
+MAGIC = b"EVZ"
+VERSION = 1
+
+NONE = 0x00
+FALSE = 0x01
+TRUE = 0x02
+INT = 0x03
+FLOAT = 0x04
+STR = 0x05
+STR_REF = 0x06
+LIST = 0x07
+DICT = 0x08
+
+_float = struct.Struct(">d")
+
+
+def dumps(data: Any, sort_keys: bool = True) -> bytes:
+    strings: Dict[str, int] = {}
+    body = bytearray()
+    _write_value(body, data, strings, sort_keys, False)
+    document = bytearray(MAGIC)
+    document.append(VERSION)
+    _write_varint(document, len(strings))
+    for string in strings:
+        _write_str(document, string)
+    document += body
+    return bytes(document)
+
+
+def loads(document: bytes) -> Any:
+    view = memoryview(document)
+    if bytes(view[:3]) != MAGIC:
+        raise BinaryFormatError("Not an eventz binary document.")
+    if len(view) < 4 or view[3] != VERSION:
+        raise BinaryFormatError("Unsupported eventz binary format version.")
+    try:
+        count, position = _read_varint(view, 4)
+        strings: List[str] = []
+        for _ in range(count):
+            string, position = _read_str(view, position)
+            strings.append(string)
+        value, position = _read_value(view, position, strings)
+    except (IndexError, struct.error):
+        raise BinaryFormatError("Truncated eventz binary document.") from None
+    except UnicodeDecodeError as error:
+        raise BinaryFormatError(
+            f"Invalid UTF-8 in eventz binary document: {error}."
+        ) from None
+    if position != len(view):
+        raise BinaryFormatError("Trailing data after eventz binary document.")
+    return value
+
+
+def _write_value(
+    out: bytearray, value: Any, strings: Dict[str, int], sort_keys: bool, intern: bool
+) -> None:
+    value_type = type(value)
+    if value is None:
+        out.append(NONE)
+    elif value_type is bool:
+        out.append(TRUE if value else FALSE)
+    elif value_type is int:
+        out.append(INT)
+        _write_varint(out, (value << 1) if value >= 0 else ((-value << 1) - 1))
+    elif value_type is float:
+        out.append(FLOAT)
+        out += _float.pack(value)
+    elif value_type is str:
+        if intern:
+            out.append(STR_REF)
+            _write_varint(out, _intern(strings, value))
+        else:
+            out.append(STR)
+            _write_str(out, value)
+    elif value_type is list or value_type is tuple:
+        out.append(LIST)
+        _write_varint(out, len(value))
+        for item in value:
+            _write_value(out, item, strings, sort_keys, False)
+    elif value_type is dict:
+        out.append(DICT)
+        _write_varint(out, len(value))
+        items = sorted(value.items()) if sort_keys else value.items()
+        for key, item in items:
+            if type(key) is not str:
+                raise TypeError(f"Keys must be strings, not {type(key).__name__}.")
+            _write_varint(out, _intern(strings, key))
+            _write_value(out, item, strings, sort_keys, key.startswith("__"))
+    else:
+        raise TypeError(f"Type {value_type.__name__} cannot be binary encoded.")
+
+
+def _read_value(view: memoryview, position: int, strings: List[str]) -> Tuple[Any, int]:
+    tag = view[position]
+    position += 1
+    if tag == STR_REF:
+        index, position = _read_varint(view, position)
+        return _lookup(strings, index), position
+    if tag == STR:
+        return _read_str(view, position)
+    if tag == INT:
+        encoded, position = _read_varint(view, position)
+        return (encoded >> 1) if not encoded & 1 else -((encoded + 1) >> 1), position
+    if tag == DICT:
+        count, position = _read_varint(view, position)
+        data = {}
+        for _ in range(count):
+            index, position = _read_varint(view, position)
+            key = _lookup(strings, index)
+            data[key], position = _read_value(view, position, strings)
+        return data, position
+    if tag == LIST:
+        count, position = _read_varint(view, position)
+        items = []
+        for _ in range(count):
+            item, position = _read_value(view, position, strings)
+            items.append(item)
+        return items, position
+    if tag == NONE:
+        return None, position
+    if tag == TRUE:
+        return True, position
+    if tag == FALSE:
+        return False, position
+    if tag == FLOAT:
+        return _float.unpack_from(view, position)[0], position + _float.size
+    raise BinaryFormatError(f"Unknown tag {tag:#04x} at byte {position - 1}.")
+
+
+def _lookup(strings: List[str], index: int) -> str:
+    if index >= len(strings):
+        raise BinaryFormatError(
+            f"String table index {index} out of range for {len(strings)} strings."
+        )
+    return strings[index]
+
+
+def _intern(strings: Dict[str, int], string: str) -> int:
+    index = strings.get(string)
+    if index is None:
+        index = strings[string] = len(strings)
+    return index
+
+
+def _write_str(out: bytearray, string: str) -> None:
+    encoded = string.encode("utf-8")
+    _write_varint(out, len(encoded))
+    out += encoded
+
+
+def _read_str(view: memoryview, position: int) -> Tuple[str, int]:
+    length, position = _read_varint(view, position)
+    end = position + length
+    if end > len(view):
+        raise IndexError(end)
+    return str(view[position:end], "utf-8"), end
+
+
+def _write_varint(out: bytearray, value: int) -> None:
+    while value > 0x7F:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _read_varint(view: memoryview, position: int) -> Tuple[int, int]:
+    result = 0
+    shift = 0
+    while True:
+        byte = view[position]
+        position += 1
+        result |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return result, position
+        shift += 7
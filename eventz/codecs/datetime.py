@@ -1,11 +1,19 @@
+import re
 from datetime import datetime, timezone
 from typing import Any, Dict
 
 from dateutil.parser import parse
+from dateutil.tz import UTC
 
 from eventz.protocols import MarshallCodecProtocol, MarshallProtocol
 
 
+# the exact shape written by Datetime._iso_js_format
+_ISO_JS_FORMAT = re.compile(
+    r"[0-9]{4}-[0-9]{2}-[0-9]{2}T[0-9]{2}:[0-9]{2}:[0-9]{2}\.[0-9]{3}Z"
+)
+
+
 class Datetime(MarshallCodecProtocol):
     def serialise(self, obj: Any, marshall: MarshallProtocol) -> Dict:
         if not isinstance(obj, datetime):
@@ -20,7 +28,10 @@ class Datetime(MarshallCodecProtocol):
         }
 
     def deserialise(self, params: Dict, marshall: MarshallProtocol) -> Any:
-        return parse(params["timestamp"])
+        timestamp = params["timestamp"]
+        if _ISO_JS_FORMAT.fullmatch(timestamp):
+            return self._parse_iso_js_format(timestamp)
+        return parse(timestamp)
 
     def handles(self, obj: Any) -> bool:
         return isinstance(obj, datetime)
@@ -31,3 +42,19 @@ class Datetime(MarshallCodecProtocol):
             .isoformat(timespec="milliseconds")
             .replace("+00:00", "Z")
         )
+
+    def _parse_iso_js_format(self, timestamp: str) -> datetime:
+        """
+        Slices apart a timestamp already known to be in the _iso_js_format
+        shape, which is much cheaper than the general dateutil parser.
+        """
+        return datetime(
+            int(timestamp[0:4]),
+            int(timestamp[5:7]),
+            int(timestamp[8:10]),
+            int(timestamp[11:13]),
+            int(timestamp[14:16]),
+            int(timestamp[17:19]),
+            int(timestamp[20:23]) * 1000,
+            tzinfo=UTC,
+        )
@@ -1,13 +1,16 @@
 from collections import defaultdict
-from typing import Dict, List, Optional
+from itertools import islice
+from typing import Dict, Iterator, List, Optional, Tuple
 
+from eventz.event_store import EventStore
 from eventz.messages import Event
-from eventz.protocols import Events, EventStoreProtocol
+from eventz.protocols import Events, EventStoreProtocol, EventStreamProtocol
 
 
-class DummyStorage(EventStoreProtocol):
+class DummyStorage(EventStore, EventStoreProtocol, EventStreamProtocol):
     def __init__(self):
         self.persisted_events: Dict[str, List[Event]] = defaultdict(list)
+        self.all_events: List[Event] = []
         self._fetch_called: int = 0
 
     def fetch(self, aggregate_id: str, seq: Optional[int] = None) -> Events:
@@ -21,15 +24,28 @@ class DummyStorage(EventStoreProtocol):
             return 0
         return slice_index
 
-    def persist(self, aggregate_id: str, events: Events) -> Events:
+    def persist(
+        self, aggregate_id: str, events: Events, expected_seq: Optional[int] = None
+    ) -> Events:
+        self._check_expected_seq(
+            aggregate_id, expected_seq, len(self.persisted_events[aggregate_id])
+        )
         events_to_return = []
         for event in events:
             seq = len(self.persisted_events[aggregate_id]) + 1
             persisted_event = event.sequence(seq)
             events_to_return.append(persisted_event)
             self.persisted_events[aggregate_id].append(persisted_event)
+            self.all_events.append(persisted_event)
         return tuple(events_to_return)
 
+    def fetch_all(
+        self, from_position: int = 1, limit: Optional[int] = None
+    ) -> Iterator[Tuple[int, Event]]:
+        start = max(from_position, 1) - 1
+        stop = None if limit is None else start + limit
+        return enumerate(islice(self.all_events, start, stop), start=start + 1)
+
     @property
     def fetch_called(self) -> int:
         return self._fetch_called
@@ -1,12 +1,13 @@
 from typing import Optional, Dict, Any, Generic, TypeVar
 from uuid import uuid4
 
-from eventz.immutable import Immutable
+from eventz.immutable import Immutable, get_attributes
 
 T = TypeVar("T")
 
 
 class Entity(Generic[T], metaclass=Immutable):
+    __slots__ = ()
     transform_underscores: bool = False
 
     @staticmethod
@@ -19,16 +20,16 @@ class Entity(Generic[T], metaclass=Immutable):
     def __eq__(self, other) -> bool:
         if not isinstance(other, Entity):
             return False
-        return self.__dict__ == other.__dict__
+        return get_attributes(self) == get_attributes(other)
 
     def __ne__(self, other) -> bool:
         if not isinstance(other, Entity):
             return True
-        return self.__dict__ != other.__dict__
+        return get_attributes(self) != get_attributes(other)
 
     def __repr__(self) -> str:
         class_name = self.__class__.__name__
-        attrs = {k: getattr(self, k) for k in vars(self)}
+        attrs = dict(get_attributes(self))
         attrs_string = " ".join([f"{k}={v}" for k, v in attrs.items()])
         return f"{class_name}({attrs_string})"
 
@@ -38,9 +39,4 @@ class Entity(Generic[T], metaclass=Immutable):
         )
 
     def _mutate_all(self, updates: Dict[str, Any]) -> T:
-        entity = self
-        for name, value in updates.items():
-            entity = Immutable.__mutate__(
-                entity, name, value, self.transform_underscores
-            )
-        return entity
+        return Immutable.__mutate_all__(self, updates, self.transform_underscores)
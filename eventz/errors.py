@@ -20,3 +20,15 @@ class ServiceNotFoundError(Exception):
 
 class UnknownCommandError(Exception):
     pass
+
+
+class ConcurrencyConflictError(Exception):
+    pass
+
+
+class NotDurableError(Exception):
+    pass
+
+
+class BinaryFormatError(ValueError):
+    pass
@@ -27,16 +27,16 @@ class EventBrokerSynchronous(EventBrokerProtocol):
         self._packet_manager: PacketManagerProtocol = packet_manager
 
     def handle(self, command_packet: Packet) -> None:
-        log.debug(f"Incoming {command_packet=}")
+        log.debug("Incoming command_packet=%r", command_packet)
         service = self._service_registry.get_service(command_packet.route)
         domain_command = service.domain_command_from_packet(command_packet)
-        log.debug(f"Domain command obtained is {domain_command=}")
+        log.debug("Domain command obtained is domain_command=%r", domain_command)
 
         this_subscriber = command_packet.subscribers[0]
         all_subscribers = self._subscription_registry.fetch(domain_command.aggregate_id)
         other_subscribers = tuple(filter(lambda s: s != this_subscriber, all_subscribers))
 
-        log.debug(f"Other subscribers are {other_subscribers=}")
+        log.debug("Other subscribers are other_subscribers=%r", other_subscribers)
         self._subscription_registry.register(
             domain_command.aggregate_id,
             this_subscriber,
@@ -50,27 +50,30 @@ class EventBrokerSynchronous(EventBrokerProtocol):
         # for a broadcast command, publish command to all other subscribers - for unicast move on
         broadcast_command_packet = self._packet_manager.get_broadcast_command_packet()
         if broadcast_command_packet:
-            log.debug(f"Publishing broadcast command {broadcast_command_packet=}")
+            log.debug(
+                "Publishing broadcast command broadcast_command_packet=%r",
+                broadcast_command_packet,
+            )
             self._publisher_registry.publish(broadcast_command_packet)
 
         # publish ack to all of the command's subscribers
         # just the emitter of the command in the case of a unicast command
         # or all of the subscribers in the case of a broadcast command
         ack_packet = self._packet_manager.get_ack_packet()
-        log.debug(f"Publishing ack packet {ack_packet=}")
+        log.debug("Publishing ack packet ack_packet=%r", ack_packet)
         self._publisher_registry.publish(ack_packet)
 
         events = service.process(command=domain_command)
-        log.debug(f"Events generated by command: {events=}")
+        log.debug("Events generated by command: events=%r", events)
         events_sent = []
         for event in events:
             event_packet = self._packet_manager.get_next_event_packet(event, events_sent)
-            log.debug(f"Publishing event packet {event_packet=}")
+            log.debug("Publishing event packet event_packet=%r", event_packet)
             self._publisher_registry.publish(event_packet)
             events_sent.append(event_packet)
 
         done_packet = self._packet_manager.get_done_event_packet(events_sent)
-        log.debug(f"Publishing done packet {done_packet=}")
+        log.debug("Publishing done packet done_packet=%r", done_packet)
         self._publisher_registry.publish(done_packet)
 
     def get_publisher(self, publisher_name: str) -> PublisherProtocol:
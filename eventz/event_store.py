@@ -1,2 +1,26 @@
+from typing import Iterator, Optional
+
+from eventz.errors import ConcurrencyConflictError
+from eventz.messages import Event
+
+
 class EventStore:
-    pass
+    def iter_events(self, aggregate_id: str, seq: Optional[int] = None) -> Iterator[Event]:
+        """
+        Stores that can decode their events one at a time override this.
+        """
+        return iter(self.fetch(aggregate_id, seq))
+
+    def _check_expected_seq(
+        self, aggregate_id: str, expected_seq: Optional[int], last_seq: int
+    ) -> None:
+        """
+        Raises if another writer has persisted events since the caller read the
+        aggregate at `expected_seq`. No check is made if `expected_seq` is None.
+        """
+        if expected_seq is not None and expected_seq != last_seq:
+            err = (
+                f"Expected aggregate '{aggregate_id}' to be at seq {expected_seq} "
+                f"but it is at seq {last_seq}."
+            )
+            raise ConcurrencyConflictError(err)
@@ -0,0 +1,167 @@
+import logging
+import os
+import time
+from queue import Empty, Queue
+from threading import Event as ThreadingEvent, Lock, Thread
+from typing import Iterator, List, Optional, Tuple
+
+from eventz.errors import NotDurableError
+from eventz.event_store import EventStore
+from eventz.messages import Event
+from eventz.protocols import (
+    DurableEventStoreProtocol,
+    Events,
+    EventStoreProtocol,
+    EventStreamProtocol,
+)
+
+log = logging.getLogger(__name__)
+log.setLevel(os.getenv("LOG_LEVEL", "INFO"))
+
+
+class _PersistRequest:
+    def __init__(self, aggregate_id: str, events: Events, expected_seq: Optional[int]):
+        self.aggregate_id: str = aggregate_id
+        self.events: Events = events
+        self.expected_seq: Optional[int] = expected_seq
+        self.result: Optional[Events] = None
+        self.error: Optional[BaseException] = None
+        self.done = ThreadingEvent()
+
+
+class EventStoreGroupCommit(EventStore, EventStoreProtocol, EventStreamProtocol):
+    """
+    Wraps a store whose persists are not individually durable and coalesces
+    persists from concurrent callers into commit windows. A writer thread
+    gathers requests until `max_batch` have arrived or `max_delay` seconds have
+    passed since the first one, writes them all, makes them durable with a
+    single `sync`, and only then returns to each caller its sequenced events.
+
+    If the `sync` fails, the events of the batch have nonetheless been written
+    and can be fetched, so their callers get a NotDurableError rather than
+    the error itself, and must not simply retry the persist, which would
+    store the events a second time.
+
+    `fetch_all` is passed through, so the wrapped store must also implement
+    EventStreamProtocol for it to be used.
+    """
+
+    def __init__(
+        self,
+        store: DurableEventStoreProtocol,
+        max_delay: float = 0.002,
+        max_batch: int = 256,
+    ):
+        self._store: DurableEventStoreProtocol = store
+        self._max_delay: float = max_delay
+        self._max_batch: int = max_batch
+        self._queue: Queue = Queue()
+        self._commits: int = 0
+        # guards _closed, so that nothing can be queued behind the stop marker
+        self._lock = Lock()
+        self._closed: bool = False
+        self._writer = Thread(target=self._work, name="EventStoreGroupCommit", daemon=True)
+        self._writer.start()
+
+    def fetch(self, aggregate_id: str, seq: Optional[int] = None) -> Tuple[Event, ...]:
+        return self._store.fetch(aggregate_id, seq)
+
+    def iter_events(self, aggregate_id: str, seq: Optional[int] = None) -> Iterator[Event]:
+        return self._store.iter_events(aggregate_id, seq)
+
+    def fetch_all(
+        self, from_position: int = 1, limit: Optional[int] = None
+    ) -> Iterator[Tuple[int, Event]]:
+        return self._store.fetch_all(from_position, limit)
+
+    def persist(
+        self, aggregate_id: str, events: Events, expected_seq: Optional[int] = None
+    ) -> Events:
+        request = _PersistRequest(aggregate_id, events, expected_seq)
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("EventStoreGroupCommit has been closed.")
+            self._queue.put(request)
+        request.done.wait()
+        if request.error is not None:
+            raise request.error
+        return request.result
+
+    def close(self) -> None:
+        """
+        Commits anything already queued and stops the writer thread.
+        """
+        with self._lock:
+            if not self._closed:
+                self._closed = True
+                self._queue.put(None)
+        self._writer.join()
+
+    @property
+    def commits(self) -> int:
+        return self._commits
+
+    def _work(self) -> None:
+        try:
+            self._run()
+        finally:
+            # anything left, e.g. if the writer failed, would otherwise wait forever
+            self._fail_queued()
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            first = self._queue.get()
+            if first is None:
+                return
+            batch = [first]
+            deadline = time.monotonic() + self._max_delay
+            while len(batch) < self._max_batch:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    request = self._queue.get(timeout=timeout)
+                except Empty:
+                    break
+                if request is None:
+                    stopping = True
+                    break
+                batch.append(request)
+            self._commit(batch)
+
+    def _commit(self, batch: List[_PersistRequest]) -> None:
+        written = []
+        for request in batch:
+            try:
+                request.result = self._store.persist(
+                    request.aggregate_id, request.events, request.expected_seq
+                )
+                written.append(request)
+            except Exception as e:
+                request.error = e
+        try:
+            self._store.sync({r.aggregate_id for r in written})
+        except Exception as e:
+            log.exception("Group commit sync failed")
+            for request in written:
+                request.error = NotDurableError(
+                    f"The events for aggregate {request.aggregate_id} were written "
+                    f"but could not be made durable: {e}"
+                )
+                request.error.__cause__ = e
+        self._commits += 1
+        for request in batch:
+            request.done.set()
+
+    def _fail_queued(self) -> None:
+        with self._lock:
+            self._closed = True
+        while True:
+            try:
+                request = self._queue.get_nowait()
+            except Empty:
+                return
+            if request is not None:
+                request.error = RuntimeError("EventStoreGroupCommit has been closed.")
+                request.done.set()
@@ -1,6 +1,13 @@
 import os
 import shutil
-from typing import Optional, Tuple
+from contextlib import contextmanager
+from threading import RLock
+from typing import Iterator, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None
 
 from eventz.event_store import EventStore
 from eventz.messages import Event
@@ -16,6 +23,7 @@ class EventStoreJsonFile(EventStore, EventStoreProtocol):
     ):
         self._storage_path: str = storage_path
         self._marshall = marshall
+        self._lock = RLock()
         if recreate_storage and os.path.isdir(self._storage_path):
             shutil.rmtree(self._storage_path)
             os.mkdir(self._storage_path)
@@ -23,13 +31,21 @@ class EventStoreJsonFile(EventStore, EventStoreProtocol):
             os.chmod(self._storage_path, 0o777)
 
     def fetch(self, aggregate_id: str, seq: Optional[int] = None) -> Tuple[Event, ...]:
+        return tuple(self.iter_events(aggregate_id, seq))
+
+    def iter_events(self, aggregate_id: str, seq: Optional[int] = None) -> Iterator[Event]:
+        """
+        Decodes the stored array incrementally, yielding each event as soon as
+        it has been read from the file.
+        """
         file_path = self._get_file_path(aggregate_id)
         if not os.path.isfile(file_path):
-            return ()
-        with open(file_path) as json_file:
-            json_string = json_file.read()
-        slice_idx = self._get_slice_index(seq)
-        return tuple(self._marshall.from_json(json_string)[slice_idx:])
+            return
+        with open(file_path, "rb") as json_file:
+            # events before seq are skipped without being deserialised
+            yield from self._marshall.iter_json(
+                json_file, skip=self._get_slice_index(seq)
+            )
 
     def _get_slice_index(self, seq: Optional[int]) -> int:
         slice_index = 0 if seq is None else seq - 1
@@ -37,17 +53,46 @@ class EventStoreJsonFile(EventStore, EventStoreProtocol):
             return 0
         return slice_index
 
-    def persist(self, aggregate_id: str, events: Events) -> Events:
+    def persist(
+        self, aggregate_id: str, events: Events, expected_seq: Optional[int] = None
+    ) -> Events:
+        """
+        Rewrites the whole array, holding a lock on the aggregate from reading
+        the existing events until the new file replaces the old one, so that
+        concurrent writers cannot overwrite each other's events.
+        """
         if not os.path.isdir(self._storage_path):
             os.mkdir(self._storage_path)
-        existing_events = self.fetch(aggregate_id)
-        persisted_events = tuple(
-            e.sequence(idx + 1)
-            for idx, e in enumerate(events)
-        )
-        with open(f"{self._storage_path}/{aggregate_id}.json", "w+") as json_file:
-            json_file.write(self._marshall.to_json(existing_events + persisted_events))
+        file_path = self._get_file_path(aggregate_id)
+        with self._exclusive(aggregate_id):
+            existing_events = self.fetch(aggregate_id)
+            self._check_expected_seq(aggregate_id, expected_seq, len(existing_events))
+            persisted_events = tuple(
+                e.sequence(len(existing_events) + idx + 1)
+                for idx, e in enumerate(events)
+            )
+            # readers see either the old or the new file, never a partial one
+            with open(f"{file_path}.tmp", "w") as json_file:
+                json_file.write(self._marshall.to_json(existing_events + persisted_events))
+            os.replace(f"{file_path}.tmp", file_path)
         return tuple(persisted_events)
 
+    @contextmanager
+    def _exclusive(self, aggregate_id: str) -> Iterator[None]:
+        """
+        Serialises writers to the same aggregate, including writers in other
+        processes where file locks are available.
+        """
+        if fcntl is None:  # pragma: no cover
+            with self._lock:
+                yield
+            return
+        with open(f"{self._get_file_path(aggregate_id)}.lock", "a") as lock_file:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
     def _get_file_path(self, aggregate_id: str) -> str:
         return f"{self._storage_path}/{aggregate_id}.json"
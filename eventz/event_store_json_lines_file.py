@@ -0,0 +1,350 @@
+import json
+import logging
+import mmap
+import os
+import shutil
+from contextlib import contextmanager
+from itertools import islice
+from threading import RLock
+from typing import BinaryIO, Dict, Iterable, Iterator, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None
+
+from eventz.event_store import EventStore
+from eventz.messages import Event
+from eventz.offset_index import OffsetIndex
+from eventz.protocols import (
+    Events,
+    MarshallProtocol,
+    DurableEventStoreProtocol,
+    EventStreamProtocol,
+)
+
+log = logging.getLogger(__name__)
+log.setLevel(os.getenv("LOG_LEVEL", "INFO"))
+
+
+class EventStoreJsonLinesFile(EventStore, DurableEventStoreProtocol, EventStreamProtocol):
+    """
+    Append-only store writing one JSON document per line to `<aggregate_id>.jsonl`.
+    Persisting only writes the new events, so the cost is proportional to the
+    batch size rather than to the length of the stream.
+
+    A sidecar `<aggregate_id>.idx` maps each `__seq__` to the byte offset of its
+    line, so `fetch` with a `seq` seeks straight to the requested tail and the
+    next `__seq__` on persist is read from the size of the index.
+
+    With `use_mmap` set, reads scan a memory map of the event file rather than
+    going through buffered file reads, and `iter_events` decodes one line at a
+    time, so reading a very large stream never holds more than one event's
+    text in memory.
+
+    Every persist also appends `[aggregate_id, seq]` records to a global `$all`
+    log with its own offset index. The line number of a record is its global
+    position, so `fetch_all` can tail the whole store in commit order without
+    enumerating the aggregates. `$all` is therefore a reserved aggregate_id.
+
+    An aggregate's events and their `$all` records are two separate appends.
+    After a crash, call `reconcile` before relying on `fetch_all`, to append
+    the records of any events the crash left out of `$all`. It reads the
+    whole store, so it is not run when the store is opened.
+
+    Writes are left to the OS to flush unless `fsync` is set, in which case
+    every persist is made durable before it returns. To get durability without
+    one fsync per persist, wrap the store in `EventStoreGroupCommit`.
+    """
+
+    _all_stream: str = "$all"
+
+    def __init__(
+        self,
+        storage_path: str,
+        marshall: MarshallProtocol,
+        recreate_storage: bool = True,
+        use_mmap: bool = False,
+        fsync: bool = False,
+    ):
+        self._storage_path: str = storage_path
+        self._marshall = marshall
+        self._use_mmap: bool = use_mmap
+        self._fsync: bool = fsync
+        self._lock = RLock()
+        if recreate_storage and os.path.isdir(self._storage_path):
+            shutil.rmtree(self._storage_path)
+            os.mkdir(self._storage_path)
+            # toy/example implementation, so don't worry about security
+            os.chmod(self._storage_path, 0o777)
+
+    def fetch(self, aggregate_id: str, seq: Optional[int] = None) -> Tuple[Event, ...]:
+        return tuple(self.iter_events(aggregate_id, seq))
+
+    def iter_events(self, aggregate_id: str, seq: Optional[int] = None) -> Iterator[Event]:
+        """
+        Lazily yields the events of the stream, decoding each one on demand.
+        """
+        file_path = self._get_file_path(aggregate_id)
+        if not os.path.isfile(file_path):
+            return
+        offset, skip = self._get_offset(aggregate_id, seq)
+        if self._use_mmap:
+            lines = self._read_lines_mmap(file_path, offset)
+        else:
+            lines = self._read_lines(file_path, offset)
+        for line in islice(lines, skip, None):
+            yield self._marshall.from_json(line)
+
+    def fetch_all(
+        self, from_position: int = 1, limit: Optional[int] = None
+    ) -> Iterator[Tuple[int, Event]]:
+        """
+        Lazily yields `(position, event)` pairs across all aggregates in commit
+        order. Positions start at 1 and have no gaps.
+        """
+        log_path = self._get_file_path(self._all_stream)
+        if not os.path.isfile(log_path):
+            return
+        from_position = max(from_position, 1)
+        offset, skip = self._get_offset(self._all_stream, from_position)
+        stop = None if limit is None else skip + limit
+        records = islice(self._read_lines(log_path, offset), skip, stop)
+        events, expected = None, None
+        for position, record in enumerate(records, start=from_position):
+            aggregate_id, seq = json.loads(record)
+            # keep reading from the same stream while the records follow on
+            if (aggregate_id, seq) != expected:
+                events = self.iter_events(aggregate_id, seq)
+            yield position, next(events)
+            expected = (aggregate_id, seq + 1)
+
+    def reconcile(self) -> int:
+        """
+        Appends to `$all` a record for every stored event it is missing,
+        i.e. those whose persist stopped after writing the aggregate's stream,
+        and returns how many were added. Recovered events take positions
+        after every event already in `$all`. Each aggregate is checked under
+        its own lock, so this is safe alongside writers, and the cost grows
+        with the size of `$all` and the number of aggregates.
+        """
+        log_path = self._get_file_path(self._all_stream)
+        recorded: Dict[str, int] = {}
+        scanned = 0
+        added = 0
+        for aggregate_id in self._list_aggregates():
+            file_path = self._get_file_path(aggregate_id)
+            with open(file_path, "ab") as jsonl_file, self._exclusive(jsonl_file):
+                last_seq = self._read_last_seq(file_path, self._get_index(aggregate_id))
+                with open(log_path, "ab") as log_file, self._exclusive(log_file):
+                    scanned = self._scan_all_stream(log_path, scanned, recorded)
+                    first_missing = recorded.get(aggregate_id, 0) + 1
+                    if first_missing > last_seq:
+                        continue
+                    records = [
+                        (json.dumps([aggregate_id, seq]) + "\n").encode("utf-8")
+                        for seq in range(first_missing, last_seq + 1)
+                    ]
+                    index = self._get_index(self._all_stream)
+                    self._read_last_seq(log_path, index)
+                    self._append_lines(log_file, index, records)
+                    scanned += sum(len(record) for record in records)
+                    recorded[aggregate_id] = last_seq
+                    added += len(records)
+        if added:
+            log.warning("Recovered %s events missing from the $all log", added)
+        return added
+
+    def _list_aggregates(self) -> List[str]:
+        suffix = ".jsonl"
+        return sorted(
+            name[: -len(suffix)]
+            for name in os.listdir(self._storage_path)
+            if name.endswith(suffix) and name != f"{self._all_stream}{suffix}"
+        )
+
+    def _scan_all_stream(
+        self, log_path: str, offset: int, recorded: Dict[str, int]
+    ) -> int:
+        """
+        Notes the highest seq recorded for each aggregate in the `$all` log
+        from `offset` on, returning the offset reached. An unterminated final
+        record, left by a crashed write, is not read.
+        """
+        with open(log_path, "rb") as log_file:
+            log_file.seek(offset)
+            for line in log_file:
+                if not line.endswith(b"\n"):
+                    break
+                offset += len(line)
+                if line.strip():
+                    aggregate_id, seq = json.loads(line)
+                    recorded[aggregate_id] = max(recorded.get(aggregate_id, 0), seq)
+        return offset
+
+    def _get_offset(self, stream: str, line_number: Optional[int]) -> Tuple[int, int]:
+        """
+        Returns the byte offset to start reading from and the number of lines
+        to skip from there. Lines are only skipped when the index is missing or
+        behind the data file.
+        """
+        if line_number is None or line_number <= 1:
+            return 0, 0
+        index = self._get_index(stream)
+        count = index.count()
+        if line_number <= count:
+            return index.offset(line_number), 0
+        if count == 0:
+            return 0, line_number - 1
+        return index.offset(count), line_number - count
+
+    def _read_lines(self, file_path: str, offset: int) -> Iterator[bytes]:
+        """
+        Yields the complete lines from `offset` on. A final line without its
+        newline is still being written, or was cut short by a crash, and is
+        left out.
+        """
+        with open(file_path, "rb") as jsonl_file:
+            jsonl_file.seek(offset)
+            for line in jsonl_file:
+                if line.endswith(b"\n") and line.strip():
+                    yield line
+
+    def _read_lines_mmap(self, file_path: str, offset: int) -> Iterator[bytes]:
+        with open(file_path, "rb") as jsonl_file:
+            size = os.fstat(jsonl_file.fileno()).st_size
+            if size == 0:
+                return
+            with mmap.mmap(jsonl_file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                position = offset
+                while position < size:
+                    line_end = mapped.find(b"\n", position)
+                    if line_end == -1:
+                        return
+                    line = mapped[position:line_end]
+                    position = line_end + 1
+                    if line.strip():
+                        yield line
+
+    def persist(
+        self, aggregate_id: str, events: Events, expected_seq: Optional[int] = None
+    ) -> Events:
+        if aggregate_id == self._all_stream:
+            raise ValueError(f"'{self._all_stream}' is a reserved aggregate_id.")
+        if not os.path.isdir(self._storage_path):
+            os.mkdir(self._storage_path)
+        file_path = self._get_file_path(aggregate_id)
+        index = self._get_index(aggregate_id)
+        with open(file_path, "ab") as jsonl_file, self._exclusive(jsonl_file):
+            last_seq = self._read_last_seq(file_path, index)
+            self._check_expected_seq(aggregate_id, expected_seq, last_seq)
+            persisted_events = tuple(
+                e.sequence(last_seq + idx + 1)
+                for idx, e in enumerate(events)
+            )
+            lines = self._marshall.to_json_many_bytes(
+                persisted_events, lines=True
+            ).splitlines(keepends=True)
+            self._append_lines(jsonl_file, index, lines)
+            self._append_to_all_stream(aggregate_id, persisted_events)
+        if self._fsync:
+            self.sync((aggregate_id,))
+        return persisted_events
+
+    def _append_to_all_stream(self, aggregate_id: str, events: Events) -> None:
+        log_path = self._get_file_path(self._all_stream)
+        index = self._get_index(self._all_stream)
+        records = [
+            (json.dumps([aggregate_id, e.__seq__]) + "\n").encode("utf-8")
+            for e in events
+        ]
+        with open(log_path, "ab") as log_file, self._exclusive(log_file):
+            self._read_last_seq(log_path, index)
+            self._append_lines(log_file, index, records)
+
+    def _append_lines(
+        self, jsonl_file: BinaryIO, index: OffsetIndex, lines: List[bytes]
+    ) -> None:
+        position = jsonl_file.seek(0, os.SEEK_END)
+        jsonl_file.write(b"".join(lines))
+        # the data must reach the file before the index refers to it
+        jsonl_file.flush()
+        offsets = []
+        for line in lines:
+            offsets.append(position)
+            position += len(line)
+        index.append(offsets)
+
+    @contextmanager
+    def _exclusive(self, jsonl_file: BinaryIO) -> Iterator[None]:
+        """
+        Serialises writers to the same stream, including writers in other
+        processes where file locks are available.
+        """
+        if fcntl is None:  # pragma: no cover
+            with self._lock:
+                yield
+            return
+        fcntl.flock(jsonl_file.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(jsonl_file.fileno(), fcntl.LOCK_UN)
+
+    def sync(self, aggregate_ids: Iterable[str]) -> None:
+        for aggregate_id in (*aggregate_ids, self._all_stream):
+            self._fsync_path(self._get_file_path(aggregate_id))
+            self._fsync_path(self._get_index(aggregate_id).file_path)
+        # new files are only durable once their directory entry is
+        self._fsync_path(self._storage_path)
+
+    def _fsync_path(self, path: str) -> None:
+        if not os.path.exists(path):
+            return
+        fd = os.open(path, os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    def _read_last_seq(self, file_path: str, index: OffsetIndex) -> int:
+        """
+        The index is written after the data, so check that exactly one line
+        follows the last indexed offset and rebuild the index if not. Called
+        before appending, so a line left unterminated by a crashed write is
+        truncated first, or the next line would be written onto its end.
+        """
+        if not os.path.isfile(file_path):
+            return 0
+        self._truncate_partial_line(file_path)
+        count = index.count()
+        offset = index.offset(count) if count else 0
+        if sum(1 for _ in self._read_lines(file_path, offset)) != min(count, 1):
+            index.rebuild(file_path)
+        return index.count()
+
+    def _truncate_partial_line(self, file_path: str) -> None:
+        with open(file_path, "rb+") as jsonl_file:
+            end = jsonl_file.seek(0, os.SEEK_END)
+            position = end
+            while position > 0:
+                start = max(position - 4096, 0)
+                jsonl_file.seek(start)
+                newline = jsonl_file.read(position - start).rfind(b"\n")
+                if newline != -1:
+                    position = start + newline + 1
+                    break
+                position = start
+            if position != end:
+                log.warning(
+                    "Truncating %s bytes of a partially written line from %s",
+                    end - position,
+                    file_path,
+                )
+                jsonl_file.truncate(position)
+
+    def _get_index(self, aggregate_id: str) -> OffsetIndex:
+        return OffsetIndex(f"{self._storage_path}/{aggregate_id}.idx")
+
+    def _get_file_path(self, aggregate_id: str) -> str:
+        return f"{self._storage_path}/{aggregate_id}.jsonl"
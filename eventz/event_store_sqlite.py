@@ -0,0 +1,161 @@
+import sqlite3
+from threading import Lock
+from typing import Iterator, List, Optional, Tuple
+
+from eventz.event_store import EventStore
+from eventz.messages import Event
+from eventz.protocols import Events, MarshallProtocol, EventStoreProtocol, EventStreamProtocol
+
+
+class EventStoreSqlite(EventStore, EventStoreProtocol, EventStreamProtocol):
+    """
+    Keeps the events of every aggregate in a single `events` table whose
+    primary key is (aggregate_id, seq), so fetching from a seq is an index range
+    scan and each persist is one transaction with a single multi-row insert.
+    The statements are constant strings, so sqlite3's statement cache prepares
+    each of them only once per connection.
+
+    Each event is also given a global `position`, assigned inside the persist
+    transaction so positions are gap-free and follow commit order. `fetch_all`
+    reads them back in pages, so the store can be tailed without holding the
+    connection for the whole scan.
+
+    With `use_binary` set, events are written in the compact format of
+    `Marshall.to_binary` rather than as JSON. Rows of either kind are read
+    back, so the option can be switched on for an existing database.
+
+    The database runs in WAL mode with `synchronous` set to FULL, so a persist
+    that has returned survives a power loss. NORMAL avoids an fsync on every
+    commit, but the most recent commits can then be lost on power loss,
+    though never corrupted, so only choose it where that is acceptable.
+    """
+
+    _page_size: int = 500
+
+    _fetch_sql = (
+        "SELECT data FROM events WHERE aggregate_id = ? AND seq >= ? ORDER BY seq"
+    )
+    _last_seq_sql = "SELECT COALESCE(MAX(seq), 0) FROM events WHERE aggregate_id = ?"
+    _last_position_sql = "SELECT COALESCE(MAX(position), 0) FROM events"
+    _insert_sql = (
+        "INSERT INTO events (aggregate_id, seq, position, data) VALUES (?, ?, ?, ?)"
+    )
+    _fetch_all_sql = (
+        "SELECT position, data FROM events WHERE position >= ? ORDER BY position LIMIT ?"
+    )
+
+    _synchronous_levels: Tuple[str, ...] = ("FULL", "EXTRA", "NORMAL")
+
+    def __init__(
+        self,
+        database_path: str,
+        marshall: MarshallProtocol,
+        use_binary: bool = False,
+        synchronous: str = "FULL",
+    ):
+        if synchronous not in self._synchronous_levels:
+            raise ValueError(
+                f"synchronous must be one of {', '.join(self._synchronous_levels)}."
+            )
+        self._marshall = marshall
+        self._use_binary: bool = use_binary
+        self._lock = Lock()
+        # autocommit mode, so that transactions are started explicitly below
+        self._connection = sqlite3.connect(
+            database_path, check_same_thread=False, isolation_level=None
+        )
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(f"PRAGMA synchronous={synchronous}")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS events ("
+            "aggregate_id TEXT NOT NULL, "
+            "seq INTEGER NOT NULL, "
+            "position INTEGER NOT NULL, "
+            "data TEXT NOT NULL, "
+            "PRIMARY KEY (aggregate_id, seq)) WITHOUT ROWID"
+        )
+        self._connection.execute(
+            "CREATE UNIQUE INDEX IF NOT EXISTS events_position ON events (position)"
+        )
+
+    def fetch(self, aggregate_id: str, seq: Optional[int] = None) -> Tuple[Event, ...]:
+        return tuple(self.iter_events(aggregate_id, seq))
+
+    def iter_events(self, aggregate_id: str, seq: Optional[int] = None) -> Iterator[Event]:
+        """
+        The rows are read up front, so the connection is not held while the
+        caller works, but each is only decoded when it is reached.
+        """
+        with self._lock:
+            rows = self._connection.execute(
+                self._fetch_sql, (aggregate_id, seq or 1)
+            ).fetchall()
+        for (data,) in rows:
+            yield self._decode(data)
+
+    def fetch_all(
+        self, from_position: int = 1, limit: Optional[int] = None
+    ) -> Iterator[Tuple[int, Event]]:
+        position = max(from_position, 1)
+        remaining = limit
+        while remaining is None or remaining > 0:
+            page_size = self._page_size if remaining is None else min(self._page_size, remaining)
+            with self._lock:
+                rows = self._connection.execute(
+                    self._fetch_all_sql, (position, page_size)
+                ).fetchall()
+            for row_position, data in rows:
+                yield row_position, self._decode(data)
+            if len(rows) < page_size:
+                return
+            position = rows[-1][0] + 1
+            if remaining is not None:
+                remaining -= len(rows)
+
+    def persist(
+        self, aggregate_id: str, events: Events, expected_seq: Optional[int] = None
+    ) -> Events:
+        with self._lock:
+            # take the write lock up front so concurrent writers queue here
+            self._connection.execute("BEGIN IMMEDIATE")
+            try:
+                (last_seq,) = self._connection.execute(
+                    self._last_seq_sql, (aggregate_id,)
+                ).fetchone()
+                self._check_expected_seq(aggregate_id, expected_seq, last_seq)
+                (last_position,) = self._connection.execute(
+                    self._last_position_sql
+                ).fetchone()
+                persisted_events = tuple(
+                    e.sequence(last_seq + idx + 1)
+                    for idx, e in enumerate(events)
+                )
+                self._connection.executemany(
+                    self._insert_sql,
+                    (
+                        (aggregate_id, e.__seq__, last_position + idx + 1, data)
+                        for idx, (e, data) in enumerate(
+                            zip(persisted_events, self._encode_many(persisted_events))
+                        )
+                    ),
+                )
+            except BaseException:
+                self._connection.execute("ROLLBACK")
+                raise
+            self._connection.execute("COMMIT")
+        return persisted_events
+
+    def _encode_many(self, events: Events) -> List:
+        if self._use_binary:
+            return [self._marshall.to_binary(e) for e in events]
+        # one document per line, so the batch splits back into one per row
+        return self._marshall.to_json_many(events, lines=True).split("\n")[:-1]
+
+    def _decode(self, data) -> Event:
+        # JSON is stored as TEXT and the binary format as a BLOB
+        if isinstance(data, bytes):
+            return self._marshall.from_binary(data)
+        return self._marshall.from_json(data)
+
+    def close(self) -> None:
+        self._connection.close()
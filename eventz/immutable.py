@@ -1,14 +1,59 @@
-from typing import TypeVar, Any, Dict
+import inspect
+from typing import TypeVar, Any, Dict, Tuple
+from weakref import WeakKeyDictionary
 
 T = TypeVar("T")
 
+# class -> names of the slots its instances have, filled by _get_slot_names
+_slot_names: "WeakKeyDictionary[type, Tuple[str, ...]]" = WeakKeyDictionary()
+# direct_construction class -> (parameter, attribute, default) for each
+# __init__ parameter, filled by _probe_field_spec when the class is created
+_field_specs: "WeakKeyDictionary[type, Tuple[Tuple[str, str, Any], ...]]" = (
+    WeakKeyDictionary()
+)
+# default of an __init__ parameter that has none
+_REQUIRED = inspect.Parameter.empty
+
 
 class Immutable(type):
+    """
+    Classes can opt in to storing their attributes in `__slots__` rather than
+    in a per-instance `__dict__` by setting `slotted = True`, which uses less
+    memory per instance. Each slotted class names the attributes its
+    instances are given in `__fields__`, including those set by the
+    `__init__` of a base class that has no slots for them, and may leave out
+    any a slotted base class already declares. Every base class must define
+    `__slots__` too for the instances to lose their `__dict__`, as the eventz
+    base classes do.
+
+    Classes whose `__init__` does nothing but store each of its arguments,
+    and its defaults, unchanged, each under an attribute of its own, can
+    also set `direct_construction = True`. Marshall and `__mutate__` then
+    build their instances with `__from_fields__`, which fills in the
+    attributes directly rather than running `__init__` and checking each
+    assignment. Which attribute each argument ends up in is found by
+    constructing an instance when the class is created, which raises
+    TypeError if `__init__` does anything else, e.g. Entity generating a
+    `uuid` when none is given. The flag is not inherited, each subclass that
+    keeps to the contract sets it itself.
+    """
+
     def __new__(mcs, name, bases, dictionary):
+        slotted = dictionary.get(
+            "slotted", any(getattr(base, "slotted", False) for base in bases)
+        )
+        if slotted and "__slots__" not in dictionary:
+            dictionary["__slots__"] = _make_slots(name, bases, dictionary)
         instance = type.__new__(mcs, name, bases, dictionary)
         instance.__setattr__ = _setattr
         instance.__delattr__ = _delattr
-        instance.__immutable__ = False
+        if "__immutable__" not in _get_slot_names(instance):
+            instance.__immutable__ = False
+        elif "__reduce__" not in dictionary:
+            # copy and pickle would otherwise restore the slots through _setattr
+            instance.__reduce__ = _reduce
+        if dictionary.get("direct_construction", False):
+            _field_specs[instance] = _probe_field_spec(instance)
         return instance
 
     def __call__(cls, *args, **kwargs):
@@ -17,11 +62,47 @@ class Immutable(type):
         """
         if "__immutable__" in kwargs:
             del kwargs["__immutable__"]
-        obj = type.__call__(cls, *args, **kwargs)
+        if "__immutable__" in _get_slot_names(cls):
+            # a slot has no class level default, so it is set before __init__
+            obj = cls.__new__(cls)
+            object.__setattr__(obj, "__immutable__", False)
+            obj.__init__(*args, **kwargs)
+        else:
+            obj = type.__call__(cls, *args, **kwargs)
         # now instance is instantiated set as immutable
         obj.__immutable__ = True
         return obj
 
+    def __from_fields__(cls, fields: Dict[str, Any]) -> Any:
+        """
+        Builds an instance from the keyword arguments its `__init__` takes
+        without calling it, using the `__init__` defaults for any that are
+        missing. Only valid for classes following the `direct_construction`
+        contract.
+        """
+        spec = _field_specs.get(cls)
+        if spec is None:
+            raise TypeError(f"{cls.__name__} does not set direct_construction.")
+        attrs = {}
+        used = 0
+        for param, attr, default in spec:
+            if param in fields:
+                attrs[attr] = fields[param]
+                used += 1
+            elif default is _REQUIRED:
+                raise TypeError(
+                    f"{cls.__name__}() missing required argument: '{param}'"
+                )
+            else:
+                attrs[attr] = default
+        if used != len(fields):
+            params = {param for param, _, _ in spec}
+            unexpected = next(name for name in fields if name not in params)
+            raise TypeError(
+                f"{cls.__name__}() got an unexpected keyword argument '{unexpected}'"
+            )
+        return _from_attributes(cls, attrs)
+
     @staticmethod
     def __mutate__(
         obj: T, name: str, value: Any, transform_underscores: bool = False
@@ -31,10 +112,27 @@ class Immutable(type):
         If `transform_underscores` is set to True then
         private attributes set as `_attr` will be passed to `__init__` as `attr`
         """
+        return Immutable.__mutate_all__(obj, {name: value}, transform_underscores)
+
+    @staticmethod
+    def __mutate_all__(
+        obj: T, updates: Dict[str, Any], transform_underscores: bool = False
+    ) -> T:
+        """
+        Mutates several parameters of an object at once, building one new
+        instance rather than one per parameter.
+        A `direct_construction` object is copied with only the updated
+        attributes replaced, the others being shared with the original.
+        """
+        current: Dict[str, Any] = get_attributes(obj)
+        if uses_direct_construction(type(obj)) and all(
+            name in current for name in updates
+        ):
+            return _copy_with(obj, updates)
         # obtain a dictionary of the objects attributes
-        attrs: Dict[str, Any] = {k: getattr(obj, k) for k in vars(obj)}
-        # set the mutated attribute to the new value
-        attrs[name] = value
+        attrs: Dict[str, Any] = dict(current)
+        # set the mutated attributes to their new values
+        attrs.update(updates)
         if transform_underscores:
             new_attrs = {}
             # remove underscore from the start of private properties
@@ -47,6 +145,155 @@ class Immutable(type):
         return type(obj)(**attrs)
 
 
+def uses_direct_construction(cls: type) -> bool:
+    """
+    Whether `cls` itself set `direct_construction`, having passed its checks.
+    """
+    return cls in _field_specs
+
+
+def get_attributes(obj: Any) -> Dict[str, Any]:
+    """
+    The instance attributes of `obj`, as `vars` would give them, whether they
+    are held in its `__dict__`, in slots or both.
+    """
+    slot_names = _get_slot_names(type(obj))
+    if not slot_names:
+        return vars(obj)
+    attrs = {}
+    for name in slot_names:
+        try:
+            attrs[name] = getattr(obj, name)
+        except AttributeError:  # an unset slot
+            pass
+    attrs.update(getattr(obj, "__dict__", {}))
+    return attrs
+
+
+def _from_attributes(cls: type, attrs: Dict[str, Any]) -> Any:
+    obj = cls.__new__(cls)
+    if _get_slot_names(cls):
+        for attr, value in attrs.items():
+            object.__setattr__(obj, attr, value)
+    else:
+        obj.__dict__.update(attrs)
+    object.__setattr__(obj, "__immutable__", True)
+    return obj
+
+
+def _copy_with(obj: T, updates: Dict[str, Any]) -> T:
+    cls = type(obj)
+    new = cls.__new__(cls)
+    for name in _get_slot_names(cls):
+        if name in updates:
+            object.__setattr__(new, name, updates[name])
+        else:
+            try:
+                object.__setattr__(new, name, getattr(obj, name))
+            except AttributeError:  # an unset slot
+                pass
+    old_dict = getattr(obj, "__dict__", None)
+    if old_dict is not None:
+        new_dict = new.__dict__
+        new_dict.update(old_dict)
+        for name, value in updates.items():
+            if name in old_dict:
+                new_dict[name] = value
+    object.__setattr__(new, "__immutable__", True)
+    return new
+
+
+def _probe_field_spec(cls: type) -> Tuple[Tuple[str, str, Any], ...]:
+    """
+    Constructs one instance of `cls` with a unique marker for each `__init__`
+    argument, to find the attribute it is stored in, and one with the
+    `__init__` defaults, to check they are stored unchanged too.
+    """
+    broken = TypeError(
+        f"{cls.__name__} cannot use direct_construction, its __init__ must "
+        f"only store each of its keyword arguments unchanged."
+    )
+    params = list(inspect.signature(cls.__init__).parameters.values())[1:]
+    if any(
+        param.kind in (param.POSITIONAL_ONLY, param.VAR_POSITIONAL, param.VAR_KEYWORD)
+        for param in params
+    ):
+        raise broken
+    markers = {param.name: object() for param in params}
+    defaults = {
+        param.name: markers[param.name] if param.default is _REQUIRED else param.default
+        for param in params
+    }
+    try:
+        attrs = _probe(cls, markers)
+        default_attrs = _probe(cls, defaults)
+    except Exception as e:
+        raise broken from e
+    attr_names = {id(value): attr for attr, value in attrs.items()}
+    if len(attrs) != len(params) or len(attr_names) != len(params):
+        raise broken
+    spec = []
+    for param in params:
+        attr = attr_names.get(id(markers[param.name]))
+        if attr is None or default_attrs.get(attr) is not defaults[param.name]:
+            raise broken
+        spec.append((param.name, attr, param.default))
+    return tuple(spec)
+
+
+def _probe(cls: type, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+    attrs = dict(get_attributes(cls(**kwargs)))
+    del attrs["__immutable__"]
+    return attrs
+
+
+def _get_slot_names(cls: type) -> Tuple[str, ...]:
+    try:
+        return _slot_names[cls]
+    except KeyError:
+        names = _slot_names[cls] = tuple(
+            name
+            for klass in reversed(cls.__mro__)
+            for name in _own_slots(klass)
+            if name not in ("__dict__", "__weakref__")
+        )
+        return names
+
+
+def _own_slots(klass: type) -> Tuple[str, ...]:
+    slots = klass.__dict__.get("__slots__", ())
+    return (slots,) if isinstance(slots, str) else tuple(slots)
+
+
+def _make_slots(
+    name: str, bases: Tuple[type, ...], dictionary: Dict[str, Any]
+) -> Tuple[str, ...]:
+    fields = dictionary.get("__fields__")
+    if fields is None:
+        raise TypeError(
+            f"{name} is slotted, so it must name the attributes its instances "
+            f"are given in __fields__."
+        )
+    if isinstance(fields, str):
+        fields = (fields,)
+    existing = {slot for base in bases for slot in _get_slot_names(base)}
+    slots = []
+    for slot in (*(_mangle(name, field) for field in fields), "__immutable__"):
+        if slot not in existing and slot not in slots:
+            slots.append(slot)
+    return tuple(slots)
+
+
+def _mangle(class_name: str, attr: str) -> str:
+    if attr.startswith("__") and not attr.endswith("__"):
+        return f"_{class_name.lstrip('_')}{attr}"
+    return attr
+
+
+def _reduce(self) -> Tuple[Any, Tuple[type, Dict[str, Any]]]:
+    return _from_attributes, (type(self), get_attributes(self))
+
+
 def _setattr(self, attr, value):
     # we'll only block "setting" once __immutable__ is True
     if self.__immutable__:
@@ -0,0 +1,57 @@
+import json
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+from eventz.protocols import JsonBackendProtocol
+
+
+class StdlibJsonBackend(JsonBackendProtocol):
+    """
+    The standard library encoder, writing compact and ASCII-only documents.
+    """
+
+    def dumps(self, data: Any, sort_keys: bool = True) -> str:
+        return json.dumps(data, sort_keys=sort_keys, separators=(",", ":"))
+
+    def dumps_bytes(self, data: Any, sort_keys: bool = True) -> bytes:
+        return self.dumps(data, sort_keys).encode("utf-8")
+
+    def loads(self, json_string: Union[str, bytes]) -> Any:
+        return json.loads(json_string)
+
+
+class OrjsonBackend(JsonBackendProtocol):
+    """
+    Uses the optional `orjson` package, which encodes straight to bytes.
+    Documents are compact like the stdlib backend's, but non-ASCII text is
+    written as UTF-8 rather than escaped, so the two are not byte-identical.
+    """
+
+    def __init__(self):
+        if orjson is None:
+            raise ImportError("OrjsonBackend requires the orjson package.")
+
+    def dumps(self, data: Any, sort_keys: bool = True) -> str:
+        return self.dumps_bytes(data, sort_keys).decode("utf-8")
+
+    def dumps_bytes(self, data: Any, sort_keys: bool = True) -> bytes:
+        option = orjson.OPT_NON_STR_KEYS
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(data, option=option)
+
+    def loads(self, json_string: Union[str, bytes]) -> Any:
+        return orjson.loads(json_string)
+
+
+def best_available_json_backend() -> JsonBackendProtocol:
+    """
+    The fastest backend whose dependencies are installed.
+    """
+    if orjson is not None:
+        return OrjsonBackend()
+    return StdlibJsonBackend()
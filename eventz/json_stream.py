@@ -0,0 +1,116 @@
+import codecs
+import json
+from typing import IO, Any, Iterator
+
+_WHITESPACE = " \t\n\r"
+# characters that may carry on a number cut off at the end of a chunk
+_NUMBER_CHARS = "0123456789.eE+-"
+
+
+def iter_json_values(stream: IO, chunk_size: int = 65536) -> Iterator[Any]:
+    """
+    Lazily yields the JSON values read from a text or binary file object,
+    which holds either a single array, whose items are yielded one at a time,
+    or a sequence of values separated by whitespace such as JSON Lines.
+
+    The stream is read `chunk_size` characters at a time and only the text of
+    the value being decoded is held in memory.
+    """
+    reader = _ChunkReader(stream, chunk_size)
+    decoder = json.JSONDecoder()
+    char = reader.peek()
+    in_array = char == "["
+    if in_array:
+        reader.advance()
+        char = reader.peek()
+        if char == "]":
+            reader.advance()
+            reader.expect_end()
+            return
+    while char is not None:
+        value = reader.decode(decoder)
+        yield value
+        char = reader.peek()
+        if not in_array:
+            continue
+        if char == ",":
+            reader.advance()
+            char = reader.peek()
+        elif char == "]":
+            reader.advance()
+            reader.expect_end()
+            return
+        else:
+            reader.fail("Expecting ',' or ']'")
+    if in_array:
+        reader.fail("Unterminated array")
+
+
+class _ChunkReader:
+    def __init__(self, stream: IO, chunk_size: int):
+        self._stream: IO = stream
+        self._chunk_size: int = chunk_size
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._buffer: str = ""
+        self._position: int = 0
+        self._eof: bool = False
+
+    def peek(self) -> Any:
+        """
+        The next character that is not whitespace, or None at the end.
+        """
+        while True:
+            buffer, position = self._buffer, self._position
+            while position < len(buffer) and buffer[position] in _WHITESPACE:
+                position += 1
+            self._position = position
+            if position < len(buffer):
+                return buffer[position]
+            if not self._read():
+                return None
+
+    def advance(self) -> None:
+        self._position += 1
+
+    def decode(self, decoder: json.JSONDecoder) -> Any:
+        while True:
+            try:
+                value, end = decoder.raw_decode(self._buffer, self._position)
+            except json.JSONDecodeError:
+                if self._read():
+                    continue
+                raise
+            # a number cut off at the end of the buffer, even part way through
+            # its fraction or exponent, may continue in the next chunk
+            if (
+                type(value) in (int, float)
+                and (end == len(self._buffer) or self._buffer[end] in _NUMBER_CHARS)
+                and self._read()
+            ):
+                continue
+            self._position = end
+            return value
+
+    def expect_end(self) -> None:
+        if self.peek() is not None:
+            self.fail("Extra data")
+
+    def fail(self, message: str) -> None:
+        raise json.JSONDecodeError(message, self._buffer, self._position)
+
+    def _read(self) -> bool:
+        """
+        Appends the next chunk to the buffer, dropping what has been consumed.
+        """
+        while not self._eof:
+            chunk = self._stream.read(self._chunk_size)
+            if not chunk:
+                self._eof = True
+            if isinstance(chunk, bytes):
+                # raises at the end if the stream stopped mid-character
+                chunk = self._decoder.decode(chunk, final=self._eof)
+            if chunk:
+                self._buffer = self._buffer[self._position:] + chunk
+                self._position = 0
+                return True
+        return False
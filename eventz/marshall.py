@@ -1,21 +1,83 @@
 from __future__ import annotations
 
 import datetime
+import functools
 import importlib
-import json
 import logging
 import os
 from enum import Enum
-from typing import Any, Dict, Optional, Callable
+from itertools import islice
+from typing import (
+    IO,
+    Any,
+    Dict,
+    FrozenSet,
+    Iterable,
+    Iterator,
+    Optional,
+    Callable,
+    Tuple,
+    Union,
+)
 
 import immutables
 import stringcase
 
-from eventz.protocols import MarshallCodecProtocol, MarshallProtocol
+from eventz import binary_format
+from eventz.immutable import get_attributes, uses_direct_construction
+from eventz.json_backends import StdlibJsonBackend
+from eventz.json_stream import iter_json_values
+from eventz.protocols import JsonBackendProtocol, MarshallCodecProtocol, MarshallProtocol
 
 log = logging.getLogger(__name__)
 log.setLevel(os.getenv("LOG_LEVEL", "INFO"))
 
+# dunder attributes emitted ahead of the data, and whether each needs serialising
+_DUNDER_FIELDS = (
+    ("__version__", False),
+    ("__msgid__", False),
+    ("__timestamp__", True),
+    ("__seq__", False),
+)
+# a sample of each builtin type that serialises to itself unless a codec claims it
+_PASSTHROUGH_SAMPLES = ("", 0, 0.0, False, None)
+# the scalar types json.loads produces, which deserialise to themselves
+_JSON_SCALAR_TYPES = frozenset((str, int, float, bool, type(None)))
+# dunder keys passed on to the constructor when set, all others are dropped
+_DESERIALISED_DUNDERS = frozenset(("__msgid__", "__timestamp__", "__seq__"))
+
+
+class _SerialisationPlan:
+    """
+    Everything about serialising instances of one class that does not depend on
+    the instance itself, worked out once on first use.
+    """
+
+    def __init__(
+        self, fqn: str, dunder_fields: Tuple[Tuple[str, bool], ...], uses_json_data: bool
+    ):
+        self.fqn: str = fqn
+        self.dunder_fields: Tuple[Tuple[str, bool], ...] = dunder_fields
+        self.uses_json_data: bool = uses_json_data
+        # attribute name -> output key, or None if the attribute is not emitted
+        self.keys: Dict[str, Optional[str]] = {}
+        # as above, with the serialisation key transform already applied
+        self.encoded_keys: Dict[str, Optional[str]] = {}
+
+
+class _DeserialisationPlan:
+    """
+    The class an `__fqn__` resolves to and how each key found in its
+    serialised form is treated, worked out once per fqn.
+    """
+
+    def __init__(self, class_: type):
+        self.class_: type = class_
+        self.direct_construction: bool = uses_direct_construction(class_)
+        # key -> True for a field, False for a dunder kept only when set,
+        # or None for a key that is not passed to the constructor
+        self.keys: Dict[str, Optional[bool]] = {}
+
 
 class Marshall(MarshallProtocol):
     def __init__(
@@ -24,41 +86,153 @@ class Marshall(MarshallProtocol):
         codecs: Dict[str, MarshallCodecProtocol] = None,
         serialisation_case: Optional[str] = "camelcase",
         deserialisation_case: Optional[str] = "snakecase",
+        key_cache_size: Optional[int] = 1024,
+        json_backend: Optional[JsonBackendProtocol] = None,
+        sort_keys: bool = True,
     ):
+        """
+        Key case conversions are memoised, keeping up to `key_cache_size`
+        distinct keys per direction (None for no limit, 0 to disable).
+
+        JSON is encoded and decoded by `json_backend`, the standard library
+        unless given, e.g. `best_available_json_backend()`. Keys are sorted so
+        that equal data always gives the same document, turn `sort_keys` off
+        where that is not needed.
+        """
         self._fqn_resolver: FqnResolverProtocol = fqn_resolver
         self._codecs = {} if codecs is None else codecs
-        self._serialisation_func: Callable[[str], str] = getattr(
-            stringcase, serialisation_case
-        )
-        self._deserialisation_func: Callable[[str], str] = getattr(
-            stringcase, deserialisation_case
+        self._json_backend: JsonBackendProtocol = (
+            StdlibJsonBackend() if json_backend is None else json_backend
         )
+        self._sort_keys: bool = sort_keys
+        # type -> codec handling it (or None), filled lazily by _get_codec
+        self._codec_dispatch: Dict[type, Optional[MarshallCodecProtocol]] = {}
+        self._passthrough_types: Optional[FrozenSet[type]] = None
+        self._serialisation_plans: Dict[type, _SerialisationPlan] = {}
+        self._deserialisation_plans: Dict[str, _DeserialisationPlan] = {}
+        self._serialisation_func: Callable[[str], str] = functools.lru_cache(
+            maxsize=key_cache_size
+        )(getattr(stringcase, serialisation_case))
+        self._deserialisation_func: Callable[[str], str] = functools.lru_cache(
+            maxsize=key_cache_size
+        )(getattr(stringcase, deserialisation_case))
 
     def register_codec(self, fcn: str, codec: MarshallCodecProtocol):
+        """
+        Which codec handles a value is cached per type, so a codec's `handles`
+        should depend only on the type of the object it is given.
+        """
         self._codecs[fcn] = codec
+        self._reset_codec_dispatch()
 
     def deregister_codec(self, fcn: str):
         del self._codecs[fcn]
+        self._reset_codec_dispatch()
 
     def has_codec(self, fcn: str):
         return fcn in self._codecs
 
+    def key_cache_info(self) -> Dict[str, Any]:
+        """
+        Hit and miss counts of the key case conversion caches.
+        """
+        return {
+            "serialisation": self._serialisation_func.cache_info(),
+            "deserialisation": self._deserialisation_func.cache_info(),
+        }
+
     def to_json(self, data: Any) -> str:
-        data = self.serialise_data(data)
-        data = self.transform_keys_serialisation(data)
-        log.info(f"Marshall.to_json data={data}")
-        result = json.dumps(data, sort_keys=True, separators=(",", ":"))
-        log.info(f"Marshall.to_json result={result}")
+        data = self.encode_data(data)
+        log.info("Marshall.to_json data=%s", data)
+        result = self._json_backend.dumps(data, self._sort_keys)
+        log.info("Marshall.to_json result=%s", result)
         return result
 
-    def from_json(self, json_string: str) -> Any:
-        data = json.loads(json_string)
+    def to_json_bytes(self, data: Any) -> bytes:
+        """
+        As `to_json`, encoded as UTF-8, for writing straight to a file or socket.
+        """
+        data = self.encode_data(data)
+        log.info("Marshall.to_json_bytes data=%s", data)
+        return self._json_backend.dumps_bytes(data, self._sort_keys)
+
+    def from_json(self, json_string: Union[str, bytes]) -> Any:
+        data = self._json_backend.loads(json_string)
         data = self.transform_keys_deserialisation(data)
-        log.info(f"Marshall.from_json data={data}")
+        log.info("Marshall.from_json data=%s", data)
         result = self.deserialise_data(data)
-        log.info(f"Marshall.from_json result={result}")
+        log.info("Marshall.from_json result=%s", result)
         return result
 
+    def to_json_many(self, items: Iterable[Any], lines: bool = False) -> str:
+        """
+        Encodes a batch of messages in one call, as a JSON array or, with
+        `lines` set, as JSON Lines: one document per line, each ending in a
+        newline.
+        """
+        return self._dump_many(items, lines, as_bytes=False)
+
+    def to_json_many_bytes(self, items: Iterable[Any], lines: bool = False) -> bytes:
+        return self._dump_many(items, lines, as_bytes=True)
+
+    def from_json_many(self, json_string: Union[str, bytes]) -> Tuple[Any, ...]:
+        """
+        Decodes either output of `to_json_many`, telling them apart by whether
+        the text starts with an array.
+        """
+        json_string = json_string.lstrip()
+        if json_string[:1] in ("[", b"["):
+            documents = self._json_backend.loads(json_string)
+        else:
+            # not splitlines, which also breaks on characters valid inside strings
+            newline = b"\n" if isinstance(json_string, bytes) else "\n"
+            loads = self._json_backend.loads
+            documents = [loads(line) for line in json_string.split(newline) if line.strip()]
+        log.info("Marshall.from_json_many with %s documents", len(documents))
+        transform_keys = self.transform_keys_deserialisation
+        return tuple(self.deserialise_data(transform_keys(d)) for d in documents)
+
+    def _dump_many(self, items: Iterable[Any], lines: bool, as_bytes: bool) -> Any:
+        encoded = [self.encode_data(item) for item in items]
+        log.info("Marshall.to_json_many with %s items", len(encoded))
+        backend, sort_keys = self._json_backend, self._sort_keys
+        dumps = backend.dumps_bytes if as_bytes else backend.dumps
+        if not lines:
+            return dumps(encoded, sort_keys)
+        newline = b"\n" if as_bytes else "\n"
+        return newline[:0].join([dumps(data, sort_keys) + newline for data in encoded])
+
+    def iter_json(
+        self, stream: IO, chunk_size: int = 65536, skip: int = 0
+    ) -> Iterator[Any]:
+        """
+        Lazily deserialises the items of a JSON array, or a sequence of JSON
+        Lines, read from a text or binary file object. Each item is yielded as
+        soon as its text has been read, so a long stream of events can be
+        consumed without first loading and decoding all of it.
+
+        The first `skip` items are parsed, to find where they end, but not
+        deserialised.
+        """
+        for data in islice(iter_json_values(stream, chunk_size), skip, None):
+            data = self.transform_keys_deserialisation(data)
+            yield self.deserialise_data(data)
+
+    def to_binary(self, data: Any) -> bytes:
+        """
+        Encodes the same structure as `to_json` in the compact format of
+        `eventz.binary_format`.
+        """
+        data = self.encode_data(data)
+        log.info("Marshall.to_binary data=%s", data)
+        return binary_format.dumps(data, self._sort_keys)
+
+    def from_binary(self, document: bytes) -> Any:
+        data = binary_format.loads(document)
+        data = self.transform_keys_deserialisation(data)
+        log.info("Marshall.from_binary data=%s", data)
+        return self.deserialise_data(data)
+
     def transform_keys_serialisation(self, data):
         return transform_keys(data, self._serialisation_func)
 
@@ -66,8 +240,9 @@ class Marshall(MarshallProtocol):
         return transform_keys(data, self._deserialisation_func)
 
     def serialise_data(self, data: Any) -> Any:
-        if self._is_handled_by_codec(data):
-            return self._object_to_codec_dict(data)
+        codec = self._get_codec(data)
+        if codec is not None:
+            return self._object_to_codec_dict(data, codec)
         elif self._is_sequence(data):
             new_sequence = []
             for item in data:
@@ -83,7 +258,45 @@ class Marshall(MarshallProtocol):
         else:
             return self._object_to_dict(data)
 
+    def encode_data(self, data: Any) -> Any:
+        """
+        Equivalent to `transform_keys_serialisation(serialise_data(data))`, but
+        the keys are transformed as the serialised structure is built, so the
+        object graph is only walked once.
+        """
+        if type(data) in self._get_passthrough_types():
+            return data
+        codec = self._get_codec(data)
+        if codec is not None:
+            # codecs produce their own (small) structure, transform it as a whole
+            return self.transform_keys_serialisation(
+                self._object_to_codec_dict(data, codec)
+            )
+        elif self._is_sequence(data):
+            return [self.encode_data(item) for item in data]
+        elif self._is_mapping(data):
+            return self._mapping_to_encoded_dict(data)
+        elif self._is_simple_type(data):
+            return data
+        else:
+            return self._object_to_dict(data, encode=True)
+
     def deserialise_data(self, data: Any) -> Any:
+        data_type = type(data)
+        if data_type in _JSON_SCALAR_TYPES:
+            return data
+        if data_type is dict:
+            # the same checks as below, testing the dict's keys only once each
+            if "_value_" in data and "_name_" in data:
+                return self._dict_to_enum(data)
+            if "__fqn__" in data:
+                return self._dict_to_object(data)
+            if "__codec__" in data:
+                return self._codec_dict_to_object(data)
+            new_mapping = {}
+            for key, value in data.items():
+                new_mapping[key] = self.deserialise_data(value)
+            return immutables.Map(new_mapping)
         if self._is_enum_dict(data):
             return self._dict_to_enum(data)
         if self._is_serialised_class(data):
@@ -103,67 +316,136 @@ class Marshall(MarshallProtocol):
         else:  # all other simple types now
             return data
 
-    def _object_to_dict(self, obj: Any) -> Dict:
-        data = {
-            "__fqn__": self._fqn_resolver.instance_to_fqn(obj)
-        }
-        if hasattr(obj, "__version__"):
-            data["__version__"] = obj.__version__
-        if hasattr(obj, "__msgid__"):
-            data["__msgid__"] = obj.__msgid__
-        if hasattr(obj, "__timestamp__"):
-            data["__timestamp__"] = self.serialise_data(obj.__timestamp__)
-        if hasattr(obj, "__seq__"):
-            data["__seq__"] = obj.__seq__
-        if hasattr(obj, "get_json_data") and callable(obj.get_json_data):
-            json_data = obj.get_json_data()
+    def _object_to_dict(self, obj: Any, encode: bool = False) -> Dict:
+        plan = self._get_serialisation_plan(obj)
+        if encode:
+            keys, key_func, value_func = (
+                plan.encoded_keys, self._serialisation_func, self.encode_data
+            )
         else:
-            json_data = vars(obj)
+            keys, key_func, value_func = plan.keys, None, self.serialise_data
+        data = {"__fqn__": plan.fqn}
+        for name, serialise in plan.dunder_fields:
+            value = getattr(obj, name)
+            data[name] = value_func(value) if serialise else value
+        json_data = obj.get_json_data() if plan.uses_json_data else get_attributes(obj)
+        passthrough_types = self._get_passthrough_types()
         for attr, value in json_data.items():
-            if not attr.startswith("__"):
-                data[attr] = self.serialise_data(value)
+            try:
+                key = keys[attr]
+            except KeyError:
+                if attr.startswith("__"):
+                    key = None
+                else:
+                    key = attr if key_func is None else key_func(attr)
+                keys[attr] = key
+            if key is None:
+                continue
+            if type(value) in passthrough_types:
+                data[key] = value
+            else:
+                data[key] = value_func(value)
         return data
 
+    def _mapping_to_encoded_dict(self, mapping: Any) -> Dict:
+        preserve_keys = bool(mapping.get("__preserve_keys__"))
+        func = self._serialisation_func
+        new_mapping = {}
+        for key, value in mapping.items():
+            if not preserve_keys and not key.startswith("__"):
+                key = func(key)
+            new_mapping[key] = self.encode_data(value)
+        return new_mapping
+
+    def _get_serialisation_plan(self, obj: Any) -> _SerialisationPlan:
+        try:
+            return self._serialisation_plans[type(obj)]
+        except KeyError:
+            plan = _SerialisationPlan(
+                fqn=self._fqn_resolver.instance_to_fqn(obj),
+                dunder_fields=tuple(f for f in _DUNDER_FIELDS if hasattr(obj, f[0])),
+                uses_json_data=callable(getattr(obj, "get_json_data", None)),
+            )
+            self._serialisation_plans[type(obj)] = plan
+            return plan
+
     def _dict_to_object(self, data: Dict) -> Any:
+        plan = self._get_deserialisation_plan(data["__fqn__"])
+        keys = plan.keys
         kwargs = {}
-        if data.get("__msgid__"):
-            kwargs["__msgid__"] = data.get("__msgid__")
-        if data.get("__timestamp__"):
-            kwargs["__timestamp__"] = self.deserialise_data(data.get("__timestamp__"))
-        if data.get("__seq__"):
-            kwargs["__seq__"] = data.get("__seq__")
         for key, value in data.items():
-            if not key.startswith("__"):
+            try:
+                is_field = keys[key]
+            except KeyError:
+                if not key.startswith("__"):
+                    is_field = True
+                elif key in _DESERIALISED_DUNDERS:
+                    is_field = False
+                else:
+                    is_field = None
+                keys[key] = is_field
+            if is_field is None or (is_field is False and not value):
+                continue
+            if type(value) in _JSON_SCALAR_TYPES:
+                kwargs[key] = value
+            else:
                 kwargs[key] = self.deserialise_data(value)
-        # @TODO add "allowed_namespaces" list to class and do a check here to protect against code injection
-        _class = self._fqn_resolver.fqn_to_type(data["__fqn__"])
-        return _class(**kwargs)
+        if plan.direct_construction:
+            return plan.class_.__from_fields__(kwargs)
+        return plan.class_(**kwargs)
+
+    def _get_deserialisation_plan(self, fqn: str) -> _DeserialisationPlan:
+        plan = self._deserialisation_plans.get(fqn)
+        if plan is None:
+            # @TODO add "allowed_namespaces" list to class and do a check here to protect against code injection
+            plan = _DeserialisationPlan(self._fqn_resolver.fqn_to_type(fqn))
+            self._deserialisation_plans[fqn] = plan
+        return plan
 
     def _codec_dict_to_object(self, data: Dict) -> Any:
-        log.debug(f"Marshall._dict_to_object data={data}")
+        log.debug("Marshall._dict_to_object data=%s", data)
         fcn = data["__codec__"]
-        log.debug(f"Codec fcn={fcn}")
+        log.debug("Codec fcn=%s", fcn)
         codec = self._codecs[fcn].deserialise(data["params"], self)
-        log.debug(f"codec={codec}")
+        log.debug("codec=%s", codec)
         return codec
 
-    def _object_to_codec_dict(self, obj: Any) -> Optional[Dict]:
-        log.debug(f"Marshall._object_to_codec_dict obj={obj}")
-        for codec in self._codecs.values():
-            log.debug(f"...codec={codec}")
-            if codec.handles(obj):
-                log.debug("... Found codec to handle object.")
-                dict_ = codec.serialise(obj, self)
-                log.debug(f"Object serialised to: {dict_}")
-                return dict_
+    def _object_to_codec_dict(self, obj: Any, codec: MarshallCodecProtocol) -> Dict:
+        log.debug("Marshall._object_to_codec_dict obj=%s codec=%s", obj, codec)
+        dict_ = codec.serialise(obj, self)
+        log.debug("Object serialised to: %s", dict_)
+        return dict_
 
     def _dict_to_enum(self, data: Dict) -> Enum:
         # @TODO add "allowed_namespaces" list to class and do a check here to protect against code injection
         _class = self._fqn_resolver.fqn_to_type(data["__fqn__"])
         return getattr(_class, data["_name_"])
 
-    def _is_handled_by_codec(self, data: Any) -> bool:
-        return any([codec.handles(data) for codec in self._codecs.values()])
+    def _reset_codec_dispatch(self) -> None:
+        self._codec_dispatch.clear()
+        self._passthrough_types = None
+
+    def _get_passthrough_types(self) -> FrozenSet[type]:
+        """
+        The builtin scalar types that no registered codec handles, whose values
+        can be copied into the serialised output as they are.
+        """
+        if self._passthrough_types is None:
+            self._passthrough_types = frozenset(
+                type(sample)
+                for sample in _PASSTHROUGH_SAMPLES
+                if self._get_codec(sample) is None
+            )
+        return self._passthrough_types
+
+    def _get_codec(self, data: Any) -> Optional[MarshallCodecProtocol]:
+        data_type = type(data)
+        try:
+            return self._codec_dispatch[data_type]
+        except KeyError:
+            codec = next((c for c in self._codecs.values() if c.handles(data)), None)
+            self._codec_dispatch[data_type] = codec
+            return codec
 
     def _is_sequence(self, data: Any) -> bool:
         return isinstance(data, (list, tuple))
@@ -206,29 +488,44 @@ class FqnResolver(FqnResolverProtocol):
         The "private" side of the map is whatever path is needed to help the
         client code transform the fqn into an instance.
         """
-        log.debug(f"FqnResolver initialised with fqn_map={fqn_map}")
+        log.debug("FqnResolver initialised with fqn_map=%s", fqn_map)
         self._public_to_private: Dict = fqn_map
         self._private_to_public: Dict = {b: a for a, b in fqn_map.items()}
+        # resolutions are fixed for the life of the map, so remember them
+        self._types: Dict[str, type] = {}
+        self._fqns: Dict[type, str] = {}
 
     def fqn_to_type(self, fqn: str) -> type:
-        log.debug(f"FqnResolver.fqn_to_type fqn={fqn}")
+        type_ = self._types.get(fqn)
+        if type_ is None:
+            type_ = self._types[fqn] = self._resolve_type(fqn)
+        return type_
+
+    def instance_to_fqn(self, instance: Any) -> str:
+        fqn = self._fqns.get(instance.__class__)
+        if fqn is None:
+            fqn = self._fqns[instance.__class__] = self._resolve_fqn(instance)
+        return fqn
+
+    def _resolve_type(self, fqn: str) -> type:
+        log.debug("FqnResolver.fqn_to_type fqn=%s", fqn)
         module_path = self._get_fqn(fqn, public=True)
-        log.debug(f"module_path={module_path}")
+        log.debug("module_path=%s", module_path)
         module_name, class_name = module_path.rsplit(".", 1)
         type_ = getattr(importlib.import_module(module_name), class_name)
-        log.debug(f"module_path resloved to type={type_}")
+        log.debug("module_path resloved to type=%s", type_)
         return type_
 
-    def instance_to_fqn(self, instance: Any) -> str:
-        log.debug(f"FqnResolver.instance_to_fqn instance={instance}")
+    def _resolve_fqn(self, instance: Any) -> str:
+        log.debug("FqnResolver.instance_to_fqn instance=%s", instance)
         path = instance.__class__.__module__ + "." + instance.__class__.__name__
-        log.debug(f"path={path}")
+        log.debug("path=%s", path)
         fqn = self._get_fqn(path, public=False)
-        log.debug(f"path rresolved to fqn={fqn}")
+        log.debug("path rresolved to fqn=%s", fqn)
         return fqn
 
     def _get_fqn(self, key: str, public: bool) -> str:
-        log.debug(f"FqnResolver._get_fqn key={key} public={public}")
+        log.debug("FqnResolver._get_fqn key=%s public=%s", key, public)
         try:
             return self._lookup_fqn(key, public)
         except KeyError as e:
@@ -237,12 +534,12 @@ class FqnResolver(FqnResolverProtocol):
                 parts = key.split(".")
                 entity = parts.pop()
                 star_key = ".".join(parts + ["*"])
-                log.debug(f"entity={entity} star_key={star_key}")
+                log.debug("entity=%s star_key=%s", entity, star_key)
                 path = self._lookup_fqn(star_key, public)
-                log.debug(f"path={path}")
+                log.debug("path=%s", path)
                 path_without_star = path[:-1]
                 resolved_fqn = path_without_star + entity
-                log.debug(f"resolved_fqn={resolved_fqn}")
+                log.debug("resolved_fqn=%s", resolved_fqn)
                 return resolved_fqn
             raise e
 
@@ -9,6 +9,8 @@ from eventz.value_object import ValueObject
 
 
 class Message(ValueObject):
+    __slots__ = ()
+
     def __init__(
         self,
         aggregate_id: str,
@@ -38,6 +40,9 @@ class RoleOptions(ValueObject):
             allowed_commands=("ShuffleDeck", "Deal"),  # commands that the client may now issue
         )
     """
+
+    direct_construction: bool = True
+
     def __init__(
         self,
         role_name: str,
@@ -50,6 +55,8 @@ class RoleOptions(ValueObject):
 
 
 class Event(Message):
+    __slots__ = ()
+
     def __init__(
         self,
         aggregate_id: str,
@@ -70,6 +77,8 @@ class Event(Message):
 
 
 class Command(Message):
+    __slots__ = ()
+
     def __init__(
         self, aggregate_id: str, __agent__: str, __msgid__: str = None, __timestamp__: datetime = None,
     ):
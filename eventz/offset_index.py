@@ -0,0 +1,55 @@
+import os
+import struct
+from typing import Iterable, Optional
+
+
+class OffsetIndex:
+    """
+    Sidecar file of fixed-width records, where record `n` holds the byte offset
+    in the data file of line `n + 1`. Looking up an offset is a single seek and
+    the number of indexed lines is derived from the size of the index file.
+    """
+
+    _record = struct.Struct("<Q")
+
+    def __init__(self, file_path: str):
+        self._file_path: str = file_path
+
+    @property
+    def file_path(self) -> str:
+        return self._file_path
+
+    def count(self) -> int:
+        if not os.path.isfile(self._file_path):
+            return 0
+        return os.path.getsize(self._file_path) // self._record.size
+
+    def offset(self, line_number: int) -> Optional[int]:
+        """
+        Returns the byte offset of the (1-based) line, or None if not indexed.
+        """
+        if line_number < 1 or line_number > self.count():
+            return None
+        with open(self._file_path, "rb") as index_file:
+            index_file.seek((line_number - 1) * self._record.size)
+            return self._record.unpack(index_file.read(self._record.size))[0]
+
+    def append(self, offsets: Iterable[int]) -> None:
+        with open(self._file_path, "ab") as index_file:
+            index_file.write(b"".join(self._record.pack(o) for o in offsets))
+
+    def rebuild(self, data_file_path: str) -> None:
+        """
+        Recreates the index by scanning every line of the data file, leaving
+        out a final line that is missing its newline.
+        """
+        offsets = []
+        if os.path.isfile(data_file_path):
+            with open(data_file_path, "rb") as data_file:
+                position = 0
+                for line in data_file:
+                    if line.endswith(b"\n") and line.strip():
+                        offsets.append(position)
+                    position += len(line)
+        with open(self._file_path, "wb") as index_file:
+            index_file.write(b"".join(self._record.pack(o) for o in offsets))
@@ -1,10 +1,24 @@
 from __future__ import annotations
 
-from typing import List, Optional, Protocol, TypeVar, Tuple, Any, Dict
+from typing import (
+    IO,
+    List,
+    Optional,
+    Protocol,
+    TypeVar,
+    Tuple,
+    Any,
+    Dict,
+    Callable,
+    Iterable,
+    Iterator,
+    Union,
+)
 from datetime import datetime
 
 from eventz.messages import Event, Command
 from eventz.packets import Packet
+from eventz.snapshots import Snapshot, SnapshotStats
 
 T = TypeVar("T")
 Events = Tuple[Event, ...]
@@ -25,7 +39,9 @@ class RepositoryProtocol(Protocol[T]):  # pragma: no cover
     def read(self, aggregate_id: str) -> Tuple[T, int]:
         ...
 
-    def persist(self, aggregate_id: str, events: Events) -> Events:
+    def persist(
+        self, aggregate_id: str, events: Events, expected_seq: Optional[int] = None
+    ) -> Events:
         ...
 
     def fetch_all_from(self, aggregate_id: str, seq: Optional[int] = None) -> Events:
@@ -34,12 +50,15 @@ class RepositoryProtocol(Protocol[T]):  # pragma: no cover
     def get_builder(self) -> AggregateBuilderProtocol:
         ...
 
+    def snapshot(self, aggregate_id: str) -> Tuple[T, int]:
+        ...
+
 
 class AggregateBuilderProtocol(Protocol[T]):  # pragma: no cover
-    def create(self, events: Events) -> T:
+    def create(self, events: Iterable[Event]) -> T:
         ...
 
-    def update(self, aggregate: T, events: Events) -> T:
+    def update(self, aggregate: T, events: Iterable[Event]) -> T:
         ...
 
 
@@ -47,12 +66,38 @@ class MarshallProtocol(Protocol):  # pragma: no cover
     def to_json(self, obj: Any) -> str:
         ...
 
-    def from_json(self, json_string: str) -> Any:
+    def to_json_bytes(self, obj: Any) -> bytes:
+        ...
+
+    def from_json(self, json_string: Union[str, bytes]) -> Any:
+        ...
+
+    def to_json_many(self, items: Iterable[Any], lines: bool = False) -> str:
+        ...
+
+    def to_json_many_bytes(self, items: Iterable[Any], lines: bool = False) -> bytes:
+        ...
+
+    def from_json_many(self, json_string: Union[str, bytes]) -> Tuple[Any, ...]:
+        ...
+
+    def iter_json(
+        self, stream: IO, chunk_size: int = 65536, skip: int = 0
+    ) -> Iterator[Any]:
+        ...
+
+    def to_binary(self, obj: Any) -> bytes:
+        ...
+
+    def from_binary(self, document: bytes) -> Any:
         ...
 
     def serialise_data(self, data: Any) -> Any:
         ...
 
+    def encode_data(self, data: Any) -> Any:
+        ...
+
     def deserialise_data(self, data: Any) -> Any:
         ...
 
@@ -80,6 +125,17 @@ class MarshallCodecProtocol(Protocol):  # pragma: no cover
         ...
 
 
+class JsonBackendProtocol(Protocol):  # pragma: no cover
+    def dumps(self, data: Any, sort_keys: bool = True) -> str:
+        ...
+
+    def dumps_bytes(self, data: Any, sort_keys: bool = True) -> bytes:
+        ...
+
+    def loads(self, json_string: Union[str, bytes]) -> Any:
+        ...
+
+
 class JsonSerlialisable(Protocol):  # pragma: no cover
     def get_json_data(self) -> Dict:
         ...
@@ -89,7 +145,71 @@ class EventStoreProtocol(Protocol):  # pragma: no cover
     def fetch(self, aggregate_id: str, seq: Optional[int] = None) -> Events:
         ...
 
-    def persist(self, aggregate_id: str, events: Events) -> Events:
+    def iter_events(self, aggregate_id: str, seq: Optional[int] = None) -> Iterator[Event]:
+        """
+        As `fetch`, but yields the events one at a time.
+        """
+        ...
+
+    def persist(
+        self, aggregate_id: str, events: Events, expected_seq: Optional[int] = None
+    ) -> Events:
+        ...
+
+
+class EventStreamProtocol(Protocol):  # pragma: no cover
+    def fetch_all(
+        self, from_position: int = 1, limit: Optional[int] = None
+    ) -> Iterator[Tuple[int, Event]]:
+        """
+        Yields `(position, event)` pairs across all aggregates in commit order.
+        """
+        ...
+
+
+class DurableEventStoreProtocol(EventStoreProtocol, Protocol):  # pragma: no cover
+    def sync(self, aggregate_ids: Iterable[str]) -> None:
+        """
+        Makes everything persisted so far for the given aggregates durable.
+        """
+        ...
+
+
+class SnapshotStoreProtocol(Protocol):  # pragma: no cover
+    def fetch(self, aggregate_id: str) -> Optional[Snapshot]:
+        ...
+
+    def persist(self, snapshot: Snapshot) -> None:
+        ...
+
+
+class AggregateCacheProtocol(Protocol):  # pragma: no cover
+    def get(self, aggregate_id: str) -> Optional[Tuple[Any, int]]:
+        ...
+
+    def put(self, aggregate_id: str, aggregate: Any, seq: int) -> None:
+        ...
+
+    def discard(self, aggregate_id: str) -> None:
+        ...
+
+
+class SnapshotPolicyProtocol(Protocol):  # pragma: no cover
+    def should_snapshot(self, stats: SnapshotStats) -> bool:
+        ...
+
+
+class SnapshotSchedulerProtocol(Protocol):  # pragma: no cover
+    def start(self, snapshotter: Callable[[str], Any]) -> None:
+        ...
+
+    def persisted(self, aggregate_id: str, seq: int) -> None:
+        ...
+
+    def rebuilt(self, aggregate_id: str, rebuild_ms: float) -> None:
+        ...
+
+    def snapshot_taken(self, aggregate_id: str, seq: int) -> None:
         ...
 
 
@@ -1,14 +1,21 @@
 import logging
 import os
-from typing import Optional, Tuple, TypeVar
+import time
+from itertools import chain
+from typing import Iterable, Iterator, Optional, Tuple, TypeVar
 
 from eventz.aggregate import Aggregate
+from eventz.messages import Event
 from eventz.protocols import (
+    AggregateCacheProtocol,
     RepositoryProtocol,
     AggregateBuilderProtocol,
     Events,
     EventStoreProtocol,
+    SnapshotSchedulerProtocol,
+    SnapshotStoreProtocol,
 )
+from eventz.snapshots import Snapshot
 
 T = TypeVar("T")
 
@@ -16,28 +23,65 @@ log = logging.getLogger(__name__)
 log.setLevel(os.getenv("LOG_LEVEL", "INFO"))
 
 
+class _SeqTracker:
+    """
+    Passes events through to the builder, noting how many there were and the
+    __seq__ of the last one.
+    """
+
+    def __init__(self, events: Iterable[Event], seq: int = 0):
+        self._events: Iterator[Event] = iter(events)
+        self.count: int = 0
+        self.seq: int = seq
+
+    def is_empty(self) -> bool:
+        first = next(self._events, None)
+        if first is None:
+            return True
+        self._events = chain((first,), self._events)
+        return False
+
+    def __iter__(self) -> Iterator[Event]:
+        for event in self._events:
+            self.count += 1
+            self.seq = event.__seq__
+            yield event
+
+
 class Repository(RepositoryProtocol[T]):
     def __init__(
         self,
         aggregate_class: type,
         storage: EventStoreProtocol,
         builder: AggregateBuilderProtocol,
+        snapshot_store: Optional[SnapshotStoreProtocol] = None,
+        snapshot_scheduler: Optional[SnapshotSchedulerProtocol] = None,
+        aggregate_cache: Optional[AggregateCacheProtocol] = None,
     ):
         self._aggregate_class: type = aggregate_class
         self._storage: EventStoreProtocol = storage
         self._builder: AggregateBuilderProtocol = builder
+        self._snapshot_store: Optional[SnapshotStoreProtocol] = snapshot_store
+        self._snapshot_scheduler: Optional[SnapshotSchedulerProtocol] = snapshot_scheduler
+        self._aggregate_cache: Optional[AggregateCacheProtocol] = aggregate_cache
+        if self._snapshot_scheduler is not None:
+            self._snapshot_scheduler.start(self.snapshot)
 
     def create(self, **kwargs) -> Events:
-        log.info(f"Repository.create with kwargs={kwargs}")
+        log.info("Repository.create with kwargs=%s", kwargs)
         if "uuid" not in kwargs:
             kwargs["uuid"] = Aggregate.make_id()
-            log.info(f"uuid not found in kwargs. Created as uuid={kwargs['uuid']}")
+            log.info("uuid not found in kwargs. Created as uuid=%s", kwargs['uuid'])
         events = getattr(self._aggregate_class, "create")(**kwargs)
-        log.info(f"{len(events)} events obtained from {self._aggregate_class}.create are:")
+        log.info(
+            "%s events obtained from %s.create are:", len(events), self._aggregate_class
+        )
         log.info(events)
-        log.info(f"Persisting events to storage with uuid={kwargs['uuid']} ...")
-        events = self._storage.persist(kwargs["uuid"], events)
+        log.info("Persisting events to storage with uuid=%s ...", kwargs['uuid'])
+        # a new aggregate must not have any events yet
+        events = self._storage.persist(kwargs["uuid"], events, expected_seq=0)
         log.info("... events persisted without error.")
+        self._notify_persisted(kwargs["uuid"], events)
         return events
 
     def read(self, aggregate_id: str) -> Tuple[T, int]:
@@ -45,37 +89,128 @@ class Repository(RepositoryProtocol[T]):
         Returns a Tuple consisting of the latest build of the aggregate and the
         __seq__ of the last event (i.e. the __seq__ of the aggregate snapshot)
         """
-        log.info(f"Repository.read with aggregate_id={aggregate_id}")
-        events = self._storage.fetch(aggregate_id=aggregate_id)
-        log.info(f"{len(events)} events obtained from storage fetch are:")
-        log.info(events)
-        return self._builder.create(events), self._get_highest_sequence(events)
+        log.info("Repository.read with aggregate_id=%s", aggregate_id)
+        started = time.perf_counter()
+        aggregate, seq, from_cache = self._read_latest_build(aggregate_id)
+        # events are decoded as the builder reaches them, not fetched up front
+        if aggregate is None:
+            events = _SeqTracker(self._storage.iter_events(aggregate_id=aggregate_id))
+            aggregate = self._builder.create(events)
+        else:
+            events = _SeqTracker(
+                self._storage.iter_events(aggregate_id=aggregate_id, seq=seq + 1), seq
+            )
+            if not events.is_empty():
+                aggregate = self._builder.update(aggregate, events)
+        seq = events.seq
+        log.info("%s events read from storage up to seq=%s", events.count, seq)
+        if self._snapshot_scheduler is not None:
+            rebuild_ms = (time.perf_counter() - started) * 1000
+            self._snapshot_scheduler.rebuilt(aggregate_id, rebuild_ms)
+        # a cached build that needed no new events is already in the cache
+        if self._aggregate_cache is not None and (not from_cache or events.count):
+            self._aggregate_cache.put(aggregate_id, aggregate, seq)
+        return aggregate, seq
+
+    def _read_latest_build(self, aggregate_id: str) -> Tuple[Optional[T], int, bool]:
+        """
+        Returns the most recent build available without replaying the stream,
+        from the aggregate cache or else the snapshot store, or (None, 0), along
+        with whether it came from the cache.
+        """
+        if self._aggregate_cache is not None:
+            cached = self._aggregate_cache.get(aggregate_id)
+            if cached is not None:
+                log.info("Cached build found at seq=%s", cached[1])
+                return cached[0], cached[1], True
+        snapshot = self._fetch_snapshot(aggregate_id)
+        if snapshot is not None:
+            log.info("Snapshot found at seq=%s", snapshot.seq)
+            return snapshot.aggregate, snapshot.seq, False
+        return None, 0, False
 
-    def _get_highest_sequence(self, events: Events) -> int:
-        if len(events) == 0:
-            return 0
-        return events[-1].__seq__
+    def _fetch_snapshot(self, aggregate_id: str) -> Optional[Snapshot]:
+        if self._snapshot_store is None:
+            return None
+        return self._snapshot_store.fetch(aggregate_id)
 
-    def persist(self, aggregate_id: str, events: Events) -> Events:
-        log.info(f"Repository.persist with aggregate_id={aggregate_id} and {len(events)} events:")
+    def persist(
+        self, aggregate_id: str, events: Events, expected_seq: Optional[int] = None
+    ) -> Events:
+        """
+        :param expected_seq: Optional __seq__ the aggregate was read at. If other
+        events have been persisted since then, ConcurrencyConflictError is raised.
+        """
+        log.info(
+            "Repository.persist with aggregate_id=%s and %s events:",
+            aggregate_id,
+            len(events),
+        )
         log.info(events)
         log.info("Persisting to storage ...")
-        events = self._storage.persist(aggregate_id, events)
+        events = self._storage.persist(aggregate_id, events, expected_seq)
         log.info("... events persisted without error.")
+        self._notify_persisted(aggregate_id, events)
+        self._advance_cache(aggregate_id, events)
         return events
 
+    def _advance_cache(self, aggregate_id: str, events: Events) -> None:
+        """
+        Applies freshly persisted events to the cached build, provided they
+        follow on directly from it. Otherwise the entry is left as it is and
+        the next read catches up from storage. The events are already stored
+        by now, so a builder error only drops the cached build.
+        """
+        if self._aggregate_cache is None or len(events) == 0:
+            return
+        cached = self._aggregate_cache.get(aggregate_id)
+        if cached is None:
+            return
+        aggregate, seq = cached
+        if events[0].__seq__ != seq + 1:
+            return
+        try:
+            aggregate = self._builder.update(aggregate, events)
+        except Exception:
+            log.exception(
+                "Could not advance the cached build of aggregate_id=%s", aggregate_id
+            )
+            self._aggregate_cache.discard(aggregate_id)
+            return
+        self._aggregate_cache.put(aggregate_id, aggregate, events[-1].__seq__)
+
+    def _notify_persisted(self, aggregate_id: str, events: Events) -> None:
+        if self._snapshot_scheduler is not None and len(events) > 0:
+            self._snapshot_scheduler.persisted(aggregate_id, events[-1].__seq__)
+
     def fetch_all_from(self, aggregate_id: str, seq: Optional[int] = None) -> Events:
         """
         :param aggregate_id:
         :param seq: Optional sequence number from where in history events should be returned @TODO
         """
         log.info(
-            f"Repository.fetch_all_from with aggregate_id={aggregate_id} and seq={seq}"
+            "Repository.fetch_all_from with aggregate_id=%s and seq=%s", aggregate_id, seq
         )
         events = self._storage.fetch(aggregate_id=aggregate_id, seq=seq)
-        log.info(f"{len(events)} events obtained from storage fetch are:")
+        log.info("%s events obtained from storage fetch are:", len(events))
         log.info(events)
         return events
 
     def get_builder(self) -> AggregateBuilderProtocol:
         return self._builder
+
+    def snapshot(self, aggregate_id: str) -> Tuple[T, int]:
+        """
+        Reads the latest build of the aggregate and, if a snapshot store is
+        configured, persists it so that later reads start from this point.
+        """
+        log.info("Repository.snapshot with aggregate_id=%s", aggregate_id)
+        aggregate, seq = self.read(aggregate_id)
+        if self._snapshot_store is not None and seq > 0:
+            self._snapshot_store.persist(
+                Snapshot(aggregate_id=aggregate_id, seq=seq, aggregate=aggregate)
+            )
+            log.info("Snapshot persisted at seq=%s", seq)
+            if self._snapshot_scheduler is not None:
+                self._snapshot_scheduler.snapshot_taken(aggregate_id, seq)
+        return aggregate, seq
@@ -4,6 +4,7 @@ from typing import Dict, List, Tuple
 from eventz.commands import ReplayCommand, SnapshotCommand
 from eventz.errors import CommandValidationError, UnknownCommandError
 from eventz.events import SnapshotEvent
+from eventz.immutable import get_attributes
 from eventz.messages import Command, Event
 from eventz.packets import Packet
 from eventz.protocols import MarshallProtocol, ServiceProtocol, RepositoryProtocol, Events
@@ -66,7 +67,7 @@ class Service(ABC, ServiceProtocol):
         )
 
     def _snapshot_command(self, command: SnapshotCommand) -> Tuple[Event, ...]:
-        aggregate, seq = self._repository.read(aggregate_id=command.aggregate_id)
+        aggregate, seq = self._repository.snapshot(aggregate_id=command.aggregate_id)
         return (
             SnapshotEvent(
                 aggregate_id=aggregate.uuid,
@@ -94,5 +95,5 @@ class Service(ABC, ServiceProtocol):
 
     def _get_state_params(self, aggregate) -> List[str]:
         return [
-            k for k in vars(aggregate).keys() if (not k.startswith("__") and k != "uuid")
+            k for k in get_attributes(aggregate).keys() if (not k.startswith("__") and k != "uuid")
         ]
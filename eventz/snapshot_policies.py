@@ -0,0 +1,37 @@
+from eventz.protocols import SnapshotPolicyProtocol
+from eventz.snapshots import SnapshotStats
+
+
+class EveryNEvents(SnapshotPolicyProtocol):
+    def __init__(self, events: int):
+        self._events: int = events
+
+    def should_snapshot(self, stats: SnapshotStats) -> bool:
+        return stats.events_since_snapshot >= self._events
+
+
+class EveryTSeconds(SnapshotPolicyProtocol):
+    def __init__(self, seconds: float):
+        self._seconds: float = seconds
+
+    def should_snapshot(self, stats: SnapshotStats) -> bool:
+        return (
+            stats.events_since_snapshot > 0
+            and stats.seconds_since_snapshot >= self._seconds
+        )
+
+
+class RebuildTimeExceeds(SnapshotPolicyProtocol):
+    """
+    Snapshot once the last observed rebuild of the aggregate took longer than `ms`.
+    """
+
+    def __init__(self, ms: float):
+        self._ms: float = ms
+
+    def should_snapshot(self, stats: SnapshotStats) -> bool:
+        return (
+            stats.events_since_snapshot > 0
+            and stats.last_rebuild_ms is not None
+            and stats.last_rebuild_ms > self._ms
+        )
@@ -0,0 +1,146 @@
+import logging
+import os
+import time
+from collections import OrderedDict
+from queue import Queue
+from threading import Lock, Thread
+from typing import Any, Callable, Dict, Optional, Sequence, Set
+
+from eventz.protocols import SnapshotPolicyProtocol, SnapshotSchedulerProtocol
+from eventz.snapshots import SnapshotStats
+
+log = logging.getLogger(__name__)
+log.setLevel(os.getenv("LOG_LEVEL", "INFO"))
+
+
+class _AggregateState:
+    def __init__(self, snapshot_time: float):
+        self.seq: int = 0
+        self.snapshot_seq: int = 0
+        self.snapshot_time: float = snapshot_time
+        self.rebuild_ms: Optional[float] = None
+
+
+class SnapshotScheduler(SnapshotSchedulerProtocol):
+    """
+    Evaluates the snapshot policies whenever events are persisted and takes the
+    snapshots that are due on a background worker thread, so that snapshot
+    writes never happen on the command path. A snapshot is due as soon as any
+    one of the policies says so.
+
+    Each scheduler serves a single Repository. Statistics are kept for the
+    `max_aggregates` most recently active aggregates; one that has been
+    evicted is tracked afresh, as if it had never been snapshotted.
+    """
+
+    def __init__(
+        self,
+        policies: Sequence[SnapshotPolicyProtocol],
+        clock: Callable[[], float] = time.monotonic,
+        max_aggregates: int = 10000,
+    ):
+        self._policies: Sequence[SnapshotPolicyProtocol] = tuple(policies)
+        self._clock: Callable[[], float] = clock
+        self._max_aggregates: int = max_aggregates
+        self._lock = Lock()
+        # least recently active first
+        self._states: Dict[str, _AggregateState] = OrderedDict()
+        self._pending: Set[str] = set()
+        self._queue: Queue = Queue()
+        self._snapshotter: Optional[Callable[[str], Any]] = None
+        self._worker: Optional[Thread] = None
+
+    def start(self, snapshotter: Callable[[str], Any]) -> None:
+        """
+        `snapshotter` is called with an aggregate_id on the worker thread,
+        i.e. `Repository.snapshot`.
+        """
+        with self._lock:
+            if self._snapshotter is not None:
+                raise RuntimeError(
+                    "SnapshotScheduler has already been started, "
+                    "each Repository needs a scheduler of its own."
+                )
+            self._snapshotter = snapshotter
+        if self._worker is None:
+            self._worker = Thread(target=self._work, name="SnapshotScheduler", daemon=True)
+            self._worker.start()
+
+    def stop(self) -> None:
+        if self._worker is not None:
+            self._queue.put(None)
+            self._worker.join()
+            self._worker = None
+        with self._lock:
+            self._snapshotter = None
+
+    def flush(self) -> None:
+        """
+        Blocks until every snapshot scheduled so far has been taken.
+        """
+        self._queue.join()
+
+    def persisted(self, aggregate_id: str, seq: int) -> None:
+        with self._lock:
+            state = self._get_state(aggregate_id)
+            state.seq = max(state.seq, seq)
+            if aggregate_id in self._pending or not self._is_due(aggregate_id, state):
+                return
+            self._pending.add(aggregate_id)
+        log.info("Scheduling snapshot of aggregate_id=%s at seq=%s", aggregate_id, seq)
+        self._queue.put(aggregate_id)
+
+    def rebuilt(self, aggregate_id: str, rebuild_ms: float) -> None:
+        with self._lock:
+            self._get_state(aggregate_id).rebuild_ms = rebuild_ms
+
+    def snapshot_taken(self, aggregate_id: str, seq: int) -> None:
+        with self._lock:
+            state = self._get_state(aggregate_id)
+            state.seq = max(state.seq, seq)
+            state.snapshot_seq = max(state.snapshot_seq, seq)
+            state.snapshot_time = self._clock()
+            state.rebuild_ms = None
+
+    def get_stats(self, aggregate_id: str) -> SnapshotStats:
+        with self._lock:
+            return self._make_stats(aggregate_id, self._get_state(aggregate_id))
+
+    def _is_due(self, aggregate_id: str, state: _AggregateState) -> bool:
+        stats = self._make_stats(aggregate_id, state)
+        return any(policy.should_snapshot(stats) for policy in self._policies)
+
+    def _make_stats(self, aggregate_id: str, state: _AggregateState) -> SnapshotStats:
+        return SnapshotStats(
+            aggregate_id=aggregate_id,
+            events_since_snapshot=state.seq - state.snapshot_seq,
+            seconds_since_snapshot=self._clock() - state.snapshot_time,
+            last_rebuild_ms=state.rebuild_ms,
+        )
+
+    def _get_state(self, aggregate_id: str) -> _AggregateState:
+        state = self._states.get(aggregate_id)
+        if state is None:
+            state = self._states[aggregate_id] = _AggregateState(
+                snapshot_time=self._clock()
+            )
+            if len(self._states) > self._max_aggregates:
+                self._states.popitem(last=False)
+        else:
+            self._states.move_to_end(aggregate_id)
+        return state
+
+    def _work(self) -> None:
+        while True:
+            aggregate_id = self._queue.get()
+            if aggregate_id is None:
+                self._queue.task_done()
+                return
+            try:
+                self._snapshotter(aggregate_id)
+            except Exception:
+                log.exception("Snapshot of aggregate_id=%s failed", aggregate_id)
+            finally:
+                with self._lock:
+                    self._pending.discard(aggregate_id)
+                self._queue.task_done()
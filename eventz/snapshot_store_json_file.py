@@ -0,0 +1,95 @@
+import json
+import os
+import shutil
+from contextlib import contextmanager
+from threading import RLock
+from typing import Iterator, Optional
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None
+
+from eventz.protocols import MarshallProtocol, SnapshotStoreProtocol
+from eventz.snapshots import Snapshot
+
+
+class SnapshotStoreJsonFile(SnapshotStoreProtocol):
+    """
+    Writes the latest snapshot of each aggregate to `<aggregate_id>.snapshot.json`.
+    The aggregate class must be resolvable by the marshall's fqn resolver.
+
+    The first line of the file is a `{"seq": ...}` header, so that persist can
+    tell whether a snapshot is newer than the stored one without decoding the
+    stored aggregate.
+    """
+
+    def __init__(
+        self,
+        storage_path: str,
+        marshall: MarshallProtocol,
+        recreate_storage: bool = True,
+    ):
+        self._storage_path: str = storage_path
+        self._marshall = marshall
+        self._lock = RLock()
+        if recreate_storage and os.path.isdir(self._storage_path):
+            shutil.rmtree(self._storage_path)
+            os.mkdir(self._storage_path)
+            # toy/example implementation, so don't worry about security
+            os.chmod(self._storage_path, 0o777)
+
+    def fetch(self, aggregate_id: str) -> Optional[Snapshot]:
+        file_path = self._get_file_path(aggregate_id)
+        if not os.path.isfile(file_path):
+            return None
+        with open(file_path) as json_file:
+            json_file.readline()  # the header
+            document = json_file.read()
+        data = self._marshall.from_json(document)
+        return Snapshot(
+            aggregate_id=aggregate_id, seq=data["seq"], aggregate=data["aggregate"]
+        )
+
+    def persist(self, snapshot: Snapshot) -> None:
+        if not os.path.isdir(self._storage_path):
+            os.mkdir(self._storage_path)
+        file_path = self._get_file_path(snapshot.aggregate_id)
+        json_string = self._marshall.to_json(
+            {"seq": snapshot.seq, "aggregate": snapshot.aggregate}
+        )
+        with self._exclusive(file_path):
+            existing_seq = self._read_seq(file_path)
+            if existing_seq is not None and existing_seq >= snapshot.seq:
+                return
+            # write then rename, so a reader never sees a partially written snapshot
+            with open(file_path + ".tmp", "w") as json_file:
+                json_file.write(json.dumps({"seq": snapshot.seq}) + "\n")
+                json_file.write(json_string)
+            os.replace(file_path + ".tmp", file_path)
+
+    def _read_seq(self, file_path: str) -> Optional[int]:
+        if not os.path.isfile(file_path):
+            return None
+        with open(file_path) as json_file:
+            return json.loads(json_file.readline())["seq"]
+
+    @contextmanager
+    def _exclusive(self, file_path: str) -> Iterator[None]:
+        """
+        Serialises writers of the same snapshot, including writers in other
+        processes where file locks are available.
+        """
+        if fcntl is None:  # pragma: no cover
+            with self._lock:
+                yield
+            return
+        with open(f"{file_path}.lock", "a") as lock_file:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+    def _get_file_path(self, aggregate_id: str) -> str:
+        return f"{self._storage_path}/{aggregate_id}.snapshot.json"
@@ -0,0 +1,22 @@
+from typing import Dict, Optional
+
+from eventz.protocols import SnapshotStoreProtocol
+from eventz.snapshots import Snapshot
+
+
+class SnapshotStoreMemory(SnapshotStoreProtocol):
+    """
+    Keeps the latest snapshot of each aggregate in a dict. Aggregates are
+    immutable, so the stored instances can be handed out directly.
+    """
+
+    def __init__(self):
+        self._snapshots: Dict[str, Snapshot] = {}
+
+    def fetch(self, aggregate_id: str) -> Optional[Snapshot]:
+        return self._snapshots.get(aggregate_id)
+
+    def persist(self, snapshot: Snapshot) -> None:
+        existing = self._snapshots.get(snapshot.aggregate_id)
+        if existing is None or snapshot.seq > existing.seq:
+            self._snapshots[snapshot.aggregate_id] = snapshot
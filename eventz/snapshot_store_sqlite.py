@@ -0,0 +1,53 @@
+import sqlite3
+from threading import Lock
+from typing import Optional
+
+from eventz.protocols import MarshallProtocol, SnapshotStoreProtocol
+from eventz.snapshots import Snapshot
+
+
+class SnapshotStoreSqlite(SnapshotStoreProtocol):
+    """
+    Keeps the latest snapshot of each aggregate in a `snapshots` table.
+    The aggregate class must be resolvable by the marshall's fqn resolver.
+    """
+
+    def __init__(self, database_path: str, marshall: MarshallProtocol):
+        self._marshall = marshall
+        self._lock = Lock()
+        self._connection = sqlite3.connect(database_path, check_same_thread=False)
+        with self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS snapshots ("
+                "aggregate_id TEXT PRIMARY KEY, "
+                "seq INTEGER NOT NULL, "
+                "data TEXT NOT NULL)"
+            )
+
+    def fetch(self, aggregate_id: str) -> Optional[Snapshot]:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT seq, data FROM snapshots WHERE aggregate_id = ?",
+                (aggregate_id,),
+            ).fetchone()
+        if row is None:
+            return None
+        seq, data = row
+        return Snapshot(
+            aggregate_id=aggregate_id,
+            seq=seq,
+            aggregate=self._marshall.from_json(data),
+        )
+
+    def persist(self, snapshot: Snapshot) -> None:
+        data = self._marshall.to_json(snapshot.aggregate)
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT INTO snapshots (aggregate_id, seq, data) VALUES (?, ?, ?) "
+                "ON CONFLICT (aggregate_id) DO UPDATE SET seq = excluded.seq, "
+                "data = excluded.data WHERE excluded.seq > snapshots.seq",
+                (snapshot.aggregate_id, snapshot.seq, data),
+            )
+
+    def close(self) -> None:
+        self._connection.close()
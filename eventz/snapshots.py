@@ -0,0 +1,32 @@
+from typing import Any, Optional
+
+from eventz.value_object import ValueObject
+
+
+class Snapshot(ValueObject):
+    """
+    The state of an aggregate as built from every event up to and including `seq`.
+    """
+
+    def __init__(self, aggregate_id: str, seq: int, aggregate: Any):
+        self.aggregate_id: str = aggregate_id
+        self.seq: int = seq
+        self.aggregate: Any = aggregate
+
+
+class SnapshotStats(ValueObject):
+    """
+    What is known about an aggregate since its last snapshot, for policies to act on.
+    """
+
+    def __init__(
+        self,
+        aggregate_id: str,
+        events_since_snapshot: int,
+        seconds_since_snapshot: float,
+        last_rebuild_ms: Optional[float] = None,
+    ):
+        self.aggregate_id: str = aggregate_id
+        self.events_since_snapshot: int = events_since_snapshot
+        self.seconds_since_snapshot: float = seconds_since_snapshot
+        self.last_rebuild_ms: Optional[float] = last_rebuild_ms
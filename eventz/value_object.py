@@ -1,26 +1,27 @@
 from typing import Generic, TypeVar
 
-from eventz.immutable import Immutable
+from eventz.immutable import Immutable, get_attributes
 
 T = TypeVar("T")
 
 
 class ValueObject(Generic[T], metaclass=Immutable):
+    __slots__ = ()
     transform_underscores: bool = False
 
     def __eq__(self, other) -> bool:
         if not isinstance(other, ValueObject):
             return False
-        return self.__dict__ == other.__dict__
+        return get_attributes(self) == get_attributes(other)
 
     def __ne__(self, other) -> bool:
         if not isinstance(other, ValueObject):
             return True
-        return self.__dict__ != other.__dict__
+        return get_attributes(self) != get_attributes(other)
 
     def __repr__(self) -> str:
         class_name = self.__class__.__name__
-        attrs = {k: getattr(self, k) for k in vars(self)}
+        attrs = dict(get_attributes(self))
         if "__immutable__" in attrs:
             del attrs["__immutable__"]
         attrs_string = " ".join([f"{k}={v}" for k, v in attrs.items()])
@@ -30,4 +30,6 @@ class ExampleService(Service):
         events = example.update(
             param_one=command.param_one, param_two=command.param_two
         )
-        return self._repository.persist(aggregate_id=command.aggregate_id, events=events)
+        return self._repository.persist(
+            aggregate_id=command.aggregate_id, events=events, expected_seq=seq
+        )
@@ -0,0 +1,49 @@
+from eventz.aggregate_cache import AggregateCache
+from tests.example.example_aggregate import ExampleAggregate
+
+
+def _aggregate(uuid: str, param_two: str = "abc") -> ExampleAggregate:
+    return ExampleAggregate(uuid=uuid, param_one=1, param_two=param_two)
+
+
+def test_get_returns_the_aggregate_and_seq():
+    cache = AggregateCache()
+    assert cache.get("a") is None
+    aggregate = _aggregate("a")
+    cache.put("a", aggregate, 3)
+    assert cache.get("a") == (aggregate, 3)
+    cache.discard("a")
+    assert cache.get("a") is None
+    assert cache.size_bytes == 0
+
+
+def test_stale_builds_do_not_replace_newer_ones():
+    cache = AggregateCache()
+    newer = _aggregate("a", "newer")
+    cache.put("a", newer, 5)
+    cache.put("a", _aggregate("a", "older"), 4)
+    assert cache.get("a") == (newer, 5)
+
+
+def test_least_recently_used_entry_is_evicted_by_count():
+    cache = AggregateCache(max_entries=2)
+    cache.put("a", _aggregate("a"), 1)
+    cache.put("b", _aggregate("b"), 1)
+    cache.get("a")
+    cache.put("c", _aggregate("c"), 1)
+    assert len(cache) == 2
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
+
+
+def test_entries_are_evicted_by_estimated_size():
+    cache = AggregateCache(max_entries=100)
+    cache.put("a", _aggregate("a"), 1)
+    entry_size = cache.size_bytes
+    cache = AggregateCache(max_entries=100, max_bytes=entry_size * 2)
+    for aggregate_id in ("a", "b", "c"):
+        cache.put(aggregate_id, _aggregate(aggregate_id), 1)
+    assert len(cache) == 2
+    assert cache.get("a") is None
+    assert cache.size_bytes <= entry_size * 2
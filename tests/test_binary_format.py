@@ -0,0 +1,78 @@
+import json
+
+import pytest
+
+from eventz import binary_format
+from eventz.errors import BinaryFormatError
+
+document = {
+    "__fqn__": "tests.ParentCreated",
+    "__seq__": 3,
+    "aggregateId": "f2a4c8d6-6f36-4e4a-9a2b-0a4c4c1f6b53",
+    "children": [
+        {"__fqn__": "tests.Child", "name": "Child One", "age": -12},
+        {"__fqn__": "tests.Child", "name": "Child Two", "age": 2 ** 70},
+    ],
+    "ratio": 0.25,
+    "flags": [True, False, None],
+    "émoji": "✓",
+}
+
+
+def test_documents_round_trip():
+    assert binary_format.loads(binary_format.dumps(document)) == document
+    for value in (None, True, 0, -1, 127, 128, -(2 ** 64), 1.5, "", "text", [], {}):
+        assert binary_format.loads(binary_format.dumps(value)) == value
+
+
+def test_repeated_keys_and_fqns_are_written_once():
+    encoded = binary_format.dumps(document)
+    assert encoded.count(b"tests.Child") == 1
+    assert encoded.count(b"name") == 1
+    assert len(encoded) < len(json.dumps(document, separators=(",", ":")))
+
+
+def test_key_order_follows_sort_keys():
+    data = {"b": 1, "a": 2}
+    assert list(binary_format.loads(binary_format.dumps(data))) == ["a", "b"]
+    assert list(binary_format.loads(binary_format.dumps(data, sort_keys=False))) == [
+        "b",
+        "a",
+    ]
+
+
+def test_unsupported_data_is_rejected():
+    with pytest.raises(TypeError):
+        binary_format.dumps({1: "one"})
+    with pytest.raises(TypeError):
+        binary_format.dumps(object())
+
+
+@pytest.mark.parametrize(
+    "encoded",
+    [
+        b"{}",
+        b"EVZ\x02\x00\x00",
+        binary_format.dumps(document)[:-3],
+        binary_format.dumps(document) + b"\x00",
+        b"EVZ\x01\x00\xff",
+    ],
+)
+def test_malformed_documents_raise(encoded):
+    with pytest.raises(BinaryFormatError):
+        binary_format.loads(encoded)
+
+
+@pytest.mark.parametrize(
+    "encoded,message",
+    [
+        (b"EVZ\x01\x00\x04\x00\x00", "Truncated"),
+        (b"EVZ\x01\x00\x05\x01\xff", "Invalid UTF-8"),
+        (b"EVZ\x01\x01\x01\xffa\x00", "Invalid UTF-8"),
+        (b"EVZ\x01\x00\x06\x05", "index 5 out of range"),
+        (b"EVZ\x01\x01\x01a\x08\x01\x01\x00", "index 1 out of range"),
+    ],
+)
+def test_corrupt_documents_raise_binary_format_errors(encoded, message):
+    with pytest.raises(BinaryFormatError, match=message):
+        binary_format.loads(encoded)
@@ -80,3 +80,18 @@ def test_mutate_all():
     model2 = model1.reset()
     assert model2.property_one == ""
     assert model2.property_two == 0
+
+
+def test_mutate_all_builds_one_new_instance(monkeypatch):
+    model1 = Model(property_one="A", property_two=1)
+    calls = []
+    init = Model.__init__
+
+    def counting_init(self, *args, **kwargs):
+        calls.append(kwargs)
+        init(self, *args, **kwargs)
+
+    monkeypatch.setattr(Model, "__init__", counting_init)
+    model2 = model1.reset()
+    assert len(calls) == 1
+    assert (model2.property_one, model2.property_two, model2.uuid) == ("", 0, model1.uuid)
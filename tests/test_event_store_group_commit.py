@@ -0,0 +1,138 @@
+from pathlib import Path
+from threading import Barrier, Thread
+from typing import Iterable, List, Set
+
+import pytest
+
+from eventz.dummy_storage import DummyStorage
+from eventz.errors import ConcurrencyConflictError, NotDurableError
+from eventz.event_store_group_commit import EventStoreGroupCommit
+from eventz.event_store_json_lines_file import EventStoreJsonLinesFile
+from eventz.marshall import Marshall, FqnResolver
+from eventz.codecs.datetime import Datetime
+from tests.conftest import parent_id1
+
+storage_path = str(Path(__file__).absolute().parent) + "/storage"
+
+
+class SyncRecordingStorage(DummyStorage):
+    def __init__(self):
+        super().__init__()
+        self.syncs: List[Set[str]] = []
+
+    def persist(self, aggregate_id, events, expected_seq=None):
+        if aggregate_id == "broken":
+            raise ValueError("cannot persist")
+        return super().persist(aggregate_id, events, expected_seq)
+
+    def sync(self, aggregate_ids: Iterable[str]) -> None:
+        self.syncs.append(set(aggregate_ids))
+
+
+def test_concurrent_persists_share_a_commit(parent_created_event):
+    storage = SyncRecordingStorage()
+    store = EventStoreGroupCommit(storage, max_delay=0.2, max_batch=8)
+    barrier = Barrier(8)
+    results = {}
+
+    def persist(aggregate_id):
+        barrier.wait()
+        results[aggregate_id] = store.persist(aggregate_id, (parent_created_event,) * 2)
+
+    threads = [Thread(target=persist, args=(f"aggregate-{i}",)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    store.close()
+    assert len(results) == 8
+    assert all([e.__seq__ for e in events] == [1, 2] for events in results.values())
+    assert store.commits < 8
+    assert set().union(*storage.syncs) == set(results)
+    assert store.fetch("aggregate-3") == results["aggregate-3"]
+
+
+def test_failed_persist_only_fails_its_own_caller(parent_created_event):
+    storage = SyncRecordingStorage()
+    store = EventStoreGroupCommit(storage, max_delay=0)
+    with pytest.raises(ValueError):
+        store.persist("broken", (parent_created_event,))
+    assert store.persist(parent_id1, (parent_created_event,))[0].__seq__ == 1
+    with pytest.raises(ConcurrencyConflictError):
+        store.persist(parent_id1, (parent_created_event,), expected_seq=0)
+    store.close()
+    with pytest.raises(RuntimeError):
+        store.persist(parent_id1, (parent_created_event,))
+
+
+class FailingSyncStorage(DummyStorage):
+    def sync(self, aggregate_ids: Iterable[str]) -> None:
+        raise OSError("disk full")
+
+
+def test_failed_sync_reports_events_written_but_not_durable(parent_created_event):
+    store = EventStoreGroupCommit(FailingSyncStorage(), max_delay=0)
+    with pytest.raises(NotDurableError) as e:
+        store.persist(parent_id1, (parent_created_event,))
+    assert isinstance(e.value.__cause__, OSError)
+    # the events were written, a retry would duplicate them
+    assert len(store.fetch(parent_id1)) == 1
+    store.close()
+
+
+def test_persists_racing_close_never_hang(parent_created_event):
+    store = EventStoreGroupCommit(SyncRecordingStorage(), max_delay=0.05)
+    outcomes = []
+
+    def persist(aggregate_id):
+        try:
+            store.persist(aggregate_id, (parent_created_event,))
+            outcomes.append("persisted")
+        except RuntimeError:
+            outcomes.append("closed")
+
+    threads = [Thread(target=persist, args=(f"aggregate-{i}",)) for i in range(20)]
+    for thread in threads[:10]:
+        thread.start()
+    store.close()
+    for thread in threads[10:]:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=5)
+    assert not any(thread.is_alive() for thread in threads)
+    assert len(outcomes) == 20
+    store.close()
+
+
+def test_json_lines_store_can_be_group_committed(parent_created_event, child_chosen_event):
+    marshall = Marshall(
+        fqn_resolver=FqnResolver(
+            fqn_map={
+                "tests.Child": "tests.example.child.Child",
+                "tests.Children": "tests.example.children.Children",
+                "tests.ParentCreated": "tests.example.parent.ParentCreated",
+                "tests.ChildChosen": "tests.example.parent.ChildChosen",
+            }
+        ),
+        codecs={"codecs.eventz.Datetime": Datetime()},
+    )
+    store = EventStoreGroupCommit(
+        EventStoreJsonLinesFile(storage_path=storage_path, marshall=marshall)
+    )
+    store.persist(parent_id1, (parent_created_event,))
+    events = store.persist(parent_id1, (child_chosen_event,))
+    store.close()
+    assert events[0].__seq__ == 2
+    assert [e.__seq__ for e in store.fetch(parent_id1)] == [1, 2]
+
+
+def test_fetch_all_reads_from_the_wrapped_store(parent_created_event, child_chosen_event):
+    store = EventStoreGroupCommit(SyncRecordingStorage(), max_delay=0)
+    store.persist(parent_id1, (parent_created_event,))
+    store.persist("other", (child_chosen_event,))
+    store.close()
+    assert [(p, e.__msgid__) for p, e in store.fetch_all()] == [
+        (1, parent_created_event.__msgid__),
+        (2, child_chosen_event.__msgid__),
+    ]
+    assert [p for p, _ in store.fetch_all(from_position=2, limit=5)] == [2]
@@ -1,7 +1,11 @@
 import json
 import os
 from pathlib import Path
+from threading import Thread
 
+import pytest
+
+from eventz.errors import ConcurrencyConflictError
 from eventz.event_store_json_file import EventStoreJsonFile
 from eventz.marshall import Marshall, FqnResolver
 from eventz.codecs.datetime import Datetime
@@ -83,4 +87,49 @@ def test_fetch_sequence_from(
         json.dump(json_events, json_file)
     # run test and make assertion
     events = store.fetch(parent_id1, seq=2)
-    assert events == (child_chosen_event.sequence(2),)
\ No newline at end of file
+    assert events == (child_chosen_event.sequence(2),)
+
+
+def test_persist_continues_the_sequence_and_checks_the_expected_seq(
+    parent_created_event, child_chosen_event
+):
+    storage_path = str(Path(__file__).absolute().parent) + "/storage"
+    store = EventStoreJsonFile(
+        storage_path=storage_path, marshall=marshall, recreate_storage=True,
+    )
+    store.persist(parent_id1, (parent_created_event,), expected_seq=0)
+    with pytest.raises(ConcurrencyConflictError):
+        store.persist(parent_id1, (child_chosen_event,), expected_seq=0)
+    events = store.persist(parent_id1, (child_chosen_event,), expected_seq=1)
+    assert events[0].__seq__ == 2
+    assert [e.__seq__ for e in store.fetch(parent_id1)] == [1, 2]
+
+
+def test_concurrent_persists_do_not_overwrite_each_other(parent_created_event):
+    storage_path = str(Path(__file__).absolute().parent) + "/storage"
+    store = EventStoreJsonFile(
+        storage_path=storage_path, marshall=marshall, recreate_storage=True,
+    )
+    threads = [
+        Thread(target=store.persist, args=(parent_id1, (parent_created_event,)))
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert [e.__seq__ for e in store.fetch(parent_id1)] == list(range(1, 9))
+
+
+def test_iter_events_decodes_the_stored_array_lazily(
+    parent_created_event, child_chosen_event
+):
+    storage_path = str(Path(__file__).absolute().parent) + "/storage"
+    store = EventStoreJsonFile(
+        storage_path=storage_path, marshall=marshall, recreate_storage=True,
+    )
+    store.persist(parent_id1, (parent_created_event, child_chosen_event, child_chosen_event))
+    events = store.iter_events(parent_id1, seq=2)
+    assert next(events).__seq__ == 2
+    assert [e.__seq__ for e in events] == [3]
+    assert list(store.iter_events("missing")) == []
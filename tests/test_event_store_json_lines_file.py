@@ -0,0 +1,234 @@
+import json
+import os
+from pathlib import Path
+
+import pytest
+
+from eventz.errors import ConcurrencyConflictError
+from eventz.event_store_json_lines_file import EventStoreJsonLinesFile
+from eventz.marshall import Marshall, FqnResolver
+from eventz.offset_index import OffsetIndex
+from eventz.codecs.datetime import Datetime
+from tests.conftest import parent_id1
+
+marshall = Marshall(
+    fqn_resolver=FqnResolver(
+        fqn_map={
+            "tests.Child": "tests.example.child.Child",
+            "tests.Children": "tests.example.children.Children",
+            "tests.ParentCreated": "tests.example.parent.ParentCreated",
+            "tests.ChildChosen": "tests.example.parent.ChildChosen",
+        }
+    ),
+    codecs={"codecs.eventz.Datetime": Datetime()},
+)
+storage_path = str(Path(__file__).absolute().parent) + "/storage"
+
+
+def test_new_sequence_of_events_can_be_persisted(
+    parent_created_event, child_chosen_event
+):
+    store = EventStoreJsonLinesFile(
+        storage_path=storage_path, marshall=marshall, recreate_storage=True,
+    )
+    assert store.fetch(parent_id1) == ()
+    events = store.persist(parent_id1, (parent_created_event, child_chosen_event,))
+    assert events == (parent_created_event.sequence(1), child_chosen_event.sequence(2))
+    with open(f"{storage_path}/{parent_id1}.jsonl") as jsonl_file:
+        lines = jsonl_file.read().splitlines()
+    assert len(lines) == 2
+    assert [json.loads(line)["__seq__"] for line in lines] == [1, 2]
+    assert lines[0] == marshall.to_json(parent_created_event.sequence(1))
+
+
+def test_persist_appends_and_continues_the_sequence(
+    parent_created_event, child_chosen_event
+):
+    store = EventStoreJsonLinesFile(
+        storage_path=storage_path, marshall=marshall, recreate_storage=True,
+    )
+    store.persist(parent_id1, (parent_created_event,))
+    events = store.persist(parent_id1, (child_chosen_event, child_chosen_event,))
+    assert [e.__seq__ for e in events] == [2, 3]
+    assert _ids(store.fetch(parent_id1)) == [
+        (parent_created_event.__msgid__, 1),
+        (child_chosen_event.__msgid__, 2),
+        (child_chosen_event.__msgid__, 3),
+    ]
+
+
+def test_index_records_the_offset_of_each_seq(
+    parent_created_event, child_chosen_event
+):
+    store = EventStoreJsonLinesFile(
+        storage_path=storage_path, marshall=marshall, recreate_storage=True,
+    )
+    store.persist(parent_id1, (parent_created_event,))
+    store.persist(parent_id1, (child_chosen_event, child_chosen_event,))
+    index = OffsetIndex(f"{storage_path}/{parent_id1}.idx")
+    assert index.count() == 3
+    with open(f"{storage_path}/{parent_id1}.jsonl", "rb") as jsonl_file:
+        data = jsonl_file.read()
+    for seq in (1, 2, 3):
+        line = data[index.offset(seq):].split(b"\n", 1)[0]
+        assert json.loads(line)["__seq__"] == seq
+    assert index.offset(4) is None
+
+
+def test_missing_or_stale_index_is_rebuilt_on_persist(
+    parent_created_event, child_chosen_event
+):
+    store = EventStoreJsonLinesFile(
+        storage_path=storage_path, marshall=marshall, recreate_storage=True,
+    )
+    store.persist(parent_id1, (parent_created_event, child_chosen_event,))
+    os.remove(f"{storage_path}/{parent_id1}.idx")
+    assert _ids(store.fetch(parent_id1, seq=2)) == [(child_chosen_event.__msgid__, 2)]
+    events = store.persist(parent_id1, (child_chosen_event,))
+    assert events[0].__seq__ == 3
+    with open(f"{storage_path}/{parent_id1}.jsonl", "a") as jsonl_file:
+        jsonl_file.write(marshall.to_json(child_chosen_event.sequence(4)) + "\n")
+    assert _ids(store.fetch(parent_id1, seq=4)) == [(child_chosen_event.__msgid__, 4)]
+    events = store.persist(parent_id1, (child_chosen_event,))
+    assert events[0].__seq__ == 5
+    assert OffsetIndex(f"{storage_path}/{parent_id1}.idx").count() == 5
+
+
+def test_a_partially_written_final_line_is_discarded(
+    parent_created_event, child_chosen_event
+):
+    store = EventStoreJsonLinesFile(
+        storage_path=storage_path, marshall=marshall, recreate_storage=True,
+    )
+    store.persist(parent_id1, (parent_created_event, child_chosen_event))
+    # a write cut short by a crash
+    with open(f"{storage_path}/{parent_id1}.jsonl", "a") as jsonl_file:
+        jsonl_file.write('{"__fqn__":"tes')
+    assert [e.__seq__ for e in store.fetch(parent_id1)] == [1, 2]
+    index = OffsetIndex(f"{storage_path}/{parent_id1}.idx")
+    index.rebuild(f"{storage_path}/{parent_id1}.jsonl")
+    assert index.count() == 2
+    events = store.persist(parent_id1, (child_chosen_event,))
+    assert events[0].__seq__ == 3
+    assert [e.__seq__ for e in store.fetch(parent_id1)] == [1, 2, 3]
+    assert OffsetIndex(f"{storage_path}/{parent_id1}.idx").count() == 3
+
+
+def test_fetch_sequence_from(parent_created_event, child_chosen_event):
+    store = EventStoreJsonLinesFile(
+        storage_path=storage_path, marshall=marshall, recreate_storage=True,
+    )
+    store.persist(parent_id1, (parent_created_event, child_chosen_event,))
+    assert _ids(store.fetch(parent_id1, seq=2)) == [(child_chosen_event.__msgid__, 2)]
+    assert store.fetch(parent_id1, seq=3) == ()
+
+
+def test_mmap_reader_yields_events_lazily(parent_created_event, child_chosen_event):
+    store = EventStoreJsonLinesFile(
+        storage_path=storage_path, marshall=marshall, recreate_storage=True, use_mmap=True,
+    )
+    assert store.fetch(parent_id1) == ()
+    store.persist(parent_id1, (parent_created_event, child_chosen_event, child_chosen_event))
+    events = store.iter_events(parent_id1)
+    assert _ids([next(events)]) == [(parent_created_event.__msgid__, 1)]
+    assert _ids(events) == [
+        (child_chosen_event.__msgid__, 2),
+        (child_chosen_event.__msgid__, 3),
+    ]
+    assert _ids(store.fetch(parent_id1, seq=3)) == [(child_chosen_event.__msgid__, 3)]
+    assert store.fetch(parent_id1, seq=4) == ()
+
+
+def test_fsync_makes_each_persist_durable(monkeypatch, parent_created_event):
+    synced = []
+    monkeypatch.setattr(os, "fsync", lambda fd: synced.append(fd))
+    store = EventStoreJsonLinesFile(
+        storage_path=storage_path, marshall=marshall, recreate_storage=True, fsync=True,
+    )
+    store.persist(parent_id1, (parent_created_event,))
+    # the event file and its index, the $all log and its index, and the directory
+    assert len(synced) == 5
+
+
+def test_persist_checks_the_expected_seq(parent_created_event, child_chosen_event):
+    store = EventStoreJsonLinesFile(
+        storage_path=storage_path, marshall=marshall, recreate_storage=True,
+    )
+    store.persist(parent_id1, (parent_created_event,), expected_seq=0)
+    with pytest.raises(ConcurrencyConflictError):
+        store.persist(parent_id1, (child_chosen_event,), expected_seq=0)
+    events = store.persist(parent_id1, (child_chosen_event,), expected_seq=1)
+    assert events[0].__seq__ == 2
+    assert len(store.fetch(parent_id1)) == 2
+
+
+def test_fetch_all_streams_every_aggregate_in_commit_order(
+    parent_created_event, child_chosen_event
+):
+    store = EventStoreJsonLinesFile(
+        storage_path=storage_path, marshall=marshall, recreate_storage=True,
+    )
+    store.persist(parent_id1, (parent_created_event, child_chosen_event))
+    store.persist("other", (parent_created_event,))
+    store.persist(parent_id1, (child_chosen_event,))
+    assert [(p, e.__msgid__, e.__seq__) for p, e in store.fetch_all()] == [
+        (1, parent_created_event.__msgid__, 1),
+        (2, child_chosen_event.__msgid__, 2),
+        (3, parent_created_event.__msgid__, 1),
+        (4, child_chosen_event.__msgid__, 3),
+    ]
+    assert [(p, e.__seq__) for p, e in store.fetch_all(from_position=2, limit=2)] == [
+        (2, 2),
+        (3, 1),
+    ]
+    assert list(store.fetch_all(from_position=5)) == []
+
+
+def test_events_missing_from_all_are_recovered_by_reconcile(
+    monkeypatch, parent_created_event, child_chosen_event
+):
+    store = EventStoreJsonLinesFile(
+        storage_path=storage_path, marshall=marshall, recreate_storage=True,
+    )
+    store.persist(parent_id1, (parent_created_event,))
+    # a crash between the aggregate append and the $all append
+    with monkeypatch.context() as patch:
+        patch.setattr(store, "_append_to_all_stream", lambda *args: None)
+        store.persist("other", (parent_created_event, child_chosen_event))
+        store.persist(parent_id1, (child_chosen_event,))
+    assert [p for p, _ in store.fetch_all()] == [1]
+    # and one part way through writing an $all record
+    with open(f"{storage_path}/$all.jsonl", "a") as log_file:
+        log_file.write('["abc",')
+    reopened = EventStoreJsonLinesFile(
+        storage_path=storage_path, marshall=marshall, recreate_storage=False,
+    )
+    assert [p for p, _ in reopened.fetch_all()] == [1]
+    assert reopened.reconcile() == 3
+    # recovered events follow the recorded ones, aggregate by aggregate
+    with open(f"{storage_path}/$all.jsonl") as log_file:
+        records = [tuple(json.loads(line)) for line in log_file]
+    assert records == [(parent_id1, 1)] + sorted(
+        [(parent_id1, 2), ("other", 1), ("other", 2)]
+    )
+    assert [(p, e.__seq__) for p, e in reopened.fetch_all()] == [
+        (p, seq) for p, (_, seq) in enumerate(records, start=1)
+    ]
+    assert reopened.reconcile() == 0
+    reopened.persist("other", (child_chosen_event,))
+    assert [p for p, _ in reopened.fetch_all()] == [1, 2, 3, 4, 5]
+
+
+def test_all_is_a_reserved_aggregate_id(parent_created_event):
+    store = EventStoreJsonLinesFile(
+        storage_path=storage_path, marshall=marshall, recreate_storage=True,
+    )
+    with pytest.raises(ValueError):
+        store.persist("$all", (parent_created_event,))
+
+
+def _ids(events):
+    """
+    Timestamps are stored at millisecond precision, so compare on identity.
+    """
+    return [(e.__msgid__, e.__seq__) for e in events]
@@ -0,0 +1,133 @@
+import pytest
+
+from eventz.errors import ConcurrencyConflictError
+from eventz.event_store_sqlite import EventStoreSqlite
+from eventz.marshall import Marshall, FqnResolver
+from eventz.codecs.datetime import Datetime
+from tests.conftest import parent_id1
+
+marshall = Marshall(
+    fqn_resolver=FqnResolver(
+        fqn_map={
+            "tests.Child": "tests.example.child.Child",
+            "tests.Children": "tests.example.children.Children",
+            "tests.ParentCreated": "tests.example.parent.ParentCreated",
+            "tests.ChildChosen": "tests.example.parent.ChildChosen",
+        }
+    ),
+    codecs={"codecs.eventz.Datetime": Datetime()},
+)
+
+
+def test_new_sequence_of_events_can_be_persisted(
+    parent_created_event, child_chosen_event
+):
+    store = EventStoreSqlite(database_path=":memory:", marshall=marshall)
+    assert store.fetch(parent_id1) == ()
+    events = store.persist(parent_id1, (parent_created_event, child_chosen_event,))
+    assert events == (parent_created_event.sequence(1), child_chosen_event.sequence(2))
+    assert _ids(store.fetch(parent_id1)) == [
+        (parent_created_event.__msgid__, 1),
+        (child_chosen_event.__msgid__, 2),
+    ]
+
+
+def test_persist_continues_the_sequence_per_aggregate(
+    parent_created_event, child_chosen_event
+):
+    store = EventStoreSqlite(database_path=":memory:", marshall=marshall)
+    store.persist(parent_id1, (parent_created_event,))
+    store.persist("other", (parent_created_event,))
+    events = store.persist(parent_id1, (child_chosen_event, child_chosen_event,))
+    assert [e.__seq__ for e in events] == [2, 3]
+    assert _ids(store.fetch("other")) == [(parent_created_event.__msgid__, 1)]
+
+
+def test_fetch_sequence_from(parent_created_event, child_chosen_event):
+    store = EventStoreSqlite(database_path=":memory:", marshall=marshall)
+    store.persist(parent_id1, (parent_created_event, child_chosen_event,))
+    assert _ids(store.fetch(parent_id1, seq=2)) == [(child_chosen_event.__msgid__, 2)]
+    assert store.fetch(parent_id1, seq=3) == ()
+
+
+def test_database_file_uses_wal_and_survives_reopening(tmp_path, parent_created_event):
+    database_path = str(tmp_path / "events.sqlite")
+    store = EventStoreSqlite(database_path=database_path, marshall=marshall)
+    store.persist(parent_id1, (parent_created_event,))
+    (journal_mode,) = store._connection.execute("PRAGMA journal_mode").fetchone()
+    assert journal_mode == "wal"
+    # 2 is FULL, so a returned persist survives power loss
+    (synchronous,) = store._connection.execute("PRAGMA synchronous").fetchone()
+    assert synchronous == 2
+    store.close()
+    store = EventStoreSqlite(database_path=database_path, marshall=marshall)
+    assert _ids(store.fetch(parent_id1)) == [(parent_created_event.__msgid__, 1)]
+    store.close()
+
+
+def test_synchronous_can_be_relaxed_explicitly(tmp_path):
+    database_path = str(tmp_path / "events.sqlite")
+    store = EventStoreSqlite(
+        database_path=database_path, marshall=marshall, synchronous="NORMAL"
+    )
+    (synchronous,) = store._connection.execute("PRAGMA synchronous").fetchone()
+    assert synchronous == 1
+    store.close()
+    with pytest.raises(ValueError):
+        EventStoreSqlite(database_path=database_path, marshall=marshall, synchronous="OFF")
+
+
+def test_persist_checks_the_expected_seq(parent_created_event, child_chosen_event):
+    store = EventStoreSqlite(database_path=":memory:", marshall=marshall)
+    store.persist(parent_id1, (parent_created_event,), expected_seq=0)
+    with pytest.raises(ConcurrencyConflictError):
+        store.persist(parent_id1, (child_chosen_event,), expected_seq=0)
+    events = store.persist(parent_id1, (child_chosen_event,), expected_seq=1)
+    assert events[0].__seq__ == 2
+    assert len(store.fetch(parent_id1)) == 2
+
+
+def test_fetch_all_streams_every_aggregate_in_commit_order(
+    parent_created_event, child_chosen_event
+):
+    store = EventStoreSqlite(database_path=":memory:", marshall=marshall)
+    store._page_size = 1
+    store.persist(parent_id1, (parent_created_event, child_chosen_event))
+    store.persist("other", (parent_created_event,))
+    store.persist(parent_id1, (child_chosen_event,))
+    assert [(p, e.__msgid__, e.__seq__) for p, e in store.fetch_all()] == [
+        (1, parent_created_event.__msgid__, 1),
+        (2, child_chosen_event.__msgid__, 2),
+        (3, parent_created_event.__msgid__, 1),
+        (4, child_chosen_event.__msgid__, 3),
+    ]
+    assert [(p, e.__seq__) for p, e in store.fetch_all(from_position=2, limit=2)] == [
+        (2, 2),
+        (3, 1),
+    ]
+    assert list(store.fetch_all(from_position=5)) == []
+
+
+def test_binary_rows_are_written_and_json_rows_still_read(
+    tmp_path, parent_created_event, child_chosen_event
+):
+    database_path = str(tmp_path / "binary.sqlite")
+    json_store = EventStoreSqlite(database_path=database_path, marshall=marshall)
+    json_store.persist(parent_id1, (parent_created_event,))
+    json_store.close()
+    store = EventStoreSqlite(
+        database_path=database_path, marshall=marshall, use_binary=True
+    )
+    store.persist(parent_id1, (child_chosen_event,))
+    rows = store._connection.execute("SELECT data FROM events ORDER BY seq").fetchall()
+    assert [type(data) for (data,) in rows] == [str, bytes]
+    assert _ids(store.fetch(parent_id1)) == [
+        (parent_created_event.__msgid__, 1),
+        (child_chosen_event.__msgid__, 2),
+    ]
+    assert [p for p, _ in store.fetch_all()] == [1, 2]
+    store.close()
+
+
+def _ids(events):
+    return [(e.__msgid__, e.__seq__) for e in events]
@@ -1,6 +1,15 @@
 from __future__ import annotations
 
-from eventz.immutable import Immutable
+import copy
+import gc
+import pickle
+import weakref
+from typing import Optional
+
+import pytest
+
+from eventz.entity import Entity
+from eventz.immutable import Immutable, get_attributes
 from eventz.messages import Event
 
 
@@ -50,3 +59,241 @@ def test_that_model_with_private_fields_mutates_correctly():
     model1 = PrivateModel(property_one=122)
     model2 = model1.increment()
     assert model2.property_one == 123
+
+
+class SlottedModel(metaclass=Immutable):
+    slotted: bool = True
+    __fields__ = ("property_one", "property_two")
+
+    def __init__(self, property_one: str, property_two: int):
+        self.property_one: str = property_one
+        self.property_two: int = property_two
+
+    def increment(self) -> SlottedModel:
+        return Immutable.__mutate__(self, "property_two", self.property_two + 1)
+
+
+class SlottedChildModel(SlottedModel):
+    __fields__ = ("property_three",)
+
+    def __init__(self, property_one: str, property_two: int, property_three: bool):
+        super().__init__(property_one, property_two)
+        self.property_three: bool = property_three
+
+
+class SlottedPrivateModel(metaclass=Immutable):
+    slotted: bool = True
+    __fields__ = ("_property_one",)
+    transform_underscores: bool = True
+
+    def __init__(self, property_one: int):
+        self._property_one: int = property_one
+
+
+class SlottedDeclaredModel(metaclass=Immutable):
+    slotted: bool = True
+    __fields__ = ("total",)
+
+    def __init__(self, one: int, two: int):
+        self.total: int = one + two
+
+
+class SlottedPrivateEntity(Entity):
+    slotted: bool = True
+    __fields__ = ("_name", "uuid")
+    transform_underscores: bool = True
+
+    def __init__(self, name: str, uuid: Optional[str] = None):
+        super().__init__(uuid)
+        self._name: str = name
+
+
+def test_slotted_models_have_no_instance_dict():
+    model = SlottedModel(property_one="A", property_two=1)
+    assert not hasattr(model, "__dict__")
+    assert SlottedModel.__slots__ == ("property_one", "property_two", "__immutable__")
+    assert get_attributes(model) == {
+        "property_one": "A",
+        "property_two": 1,
+        "__immutable__": True,
+    }
+    with pytest.raises(AttributeError):
+        model.property_one = "B"
+    with pytest.raises(AttributeError):
+        model.property_four = "B"
+
+
+def test_slotted_models_mutate_like_dict_based_ones():
+    model1 = SlottedModel(property_one="A", property_two=1)
+    model2 = model1.increment()
+    assert (model1.property_two, model2.property_two) == (1, 2)
+    private_model = SlottedPrivateModel(property_one=122)
+    assert SlottedPrivateModel.__slots__ == ("_property_one", "__immutable__")
+    mutated = Immutable.__mutate__(private_model, "_property_one", 123, True)
+    assert mutated._property_one == 123
+
+
+def test_slotted_subclasses_only_add_their_own_fields():
+    model = SlottedChildModel(property_one="A", property_two=1, property_three=True)
+    assert not hasattr(model, "__dict__")
+    assert SlottedChildModel.__slots__ == ("property_three",)
+    assert get_attributes(model)["property_three"] is True
+
+
+def test_slotted_fields_can_be_declared():
+    model = SlottedDeclaredModel(one=1, two=2)
+    assert SlottedDeclaredModel.__slots__ == ("total", "__immutable__")
+    assert model.total == 3
+
+
+def test_slotted_classes_must_declare_their_fields():
+    with pytest.raises(TypeError, match="__fields__"):
+
+        class UndeclaredModel(metaclass=Immutable):
+            slotted: bool = True
+
+            def __init__(self, one: int):
+                self.one: int = one
+
+
+def test_classes_are_not_kept_alive_by_the_metaclass():
+    class TemporaryModel(metaclass=Immutable):
+        slotted: bool = True
+        direct_construction: bool = True
+        __fields__ = ("one",)
+
+        def __init__(self, one: int):
+            self.one: int = one
+
+    TemporaryModel.__from_fields__({"one": 1})
+    reference = weakref.ref(TemporaryModel)
+    del TemporaryModel
+    gc.collect()
+    assert reference() is None
+
+
+def test_slots_include_the_fields_base_inits_set():
+    entity = SlottedPrivateEntity(name="A")
+    assert SlottedPrivateEntity.__slots__ == ("_name", "uuid", "__immutable__")
+    assert not hasattr(entity, "__dict__")
+    mutated = entity._mutate("_name", "B")
+    assert (mutated._name, mutated.uuid) == ("B", entity.uuid)
+
+
+def test_slotted_models_can_be_copied_and_pickled():
+    model = SlottedChildModel(property_one="A", property_two=[1], property_three=True)
+    for duplicate in (
+        copy.copy(model),
+        copy.deepcopy(model),
+        pickle.loads(pickle.dumps(model)),
+    ):
+        assert get_attributes(duplicate) == get_attributes(model)
+        with pytest.raises(AttributeError):
+            duplicate.property_one = "B"
+    assert copy.deepcopy(model).property_two is not model.property_two
+
+
+class DirectModel(metaclass=Immutable):
+    direct_construction: bool = True
+
+    def __init__(self, property_one: str, property_two: int = 2):
+        self.property_one: str = property_one
+        self.property_two: int = property_two
+
+
+class DirectSlottedPrivateModel(metaclass=Immutable):
+    slotted: bool = True
+    __fields__ = ("_property_one",)
+    direct_construction: bool = True
+    transform_underscores: bool = True
+
+    def __init__(self, property_one: int):
+        self._property_one: int = property_one
+
+
+def test_direct_construction_matches_init():
+    model = DirectModel.__from_fields__({"property_one": "A", "property_two": 1})
+    assert get_attributes(model) == get_attributes(DirectModel("A", 1))
+    with pytest.raises(AttributeError):
+        model.property_one = "B"
+    private_model = DirectSlottedPrivateModel.__from_fields__({"property_one": 1})
+    assert get_attributes(private_model) == get_attributes(
+        DirectSlottedPrivateModel(property_one=1)
+    )
+
+
+def test_direct_construction_uses_init_defaults_and_rejects_bad_fields():
+    assert DirectModel.__from_fields__({"property_one": "A"}).property_two == 2
+    with pytest.raises(TypeError):
+        DirectModel.__from_fields__({"property_two": 1})
+    with pytest.raises(TypeError):
+        DirectModel.__from_fields__({"property_one": "A", "property_three": 3})
+
+
+def test_direct_construction_is_rejected_unless_init_only_stores_its_arguments():
+    with pytest.raises(TypeError):
+        # Entity generates a uuid when none is given
+        class DirectEntity(Entity):
+            direct_construction: bool = True
+            transform_underscores: bool = True
+
+            def __init__(self, name: str, uuid: Optional[str] = None):
+                super().__init__(uuid)
+                self._name: str = name
+
+    with pytest.raises(TypeError):
+        class DirectComputedModel(metaclass=Immutable):
+            direct_construction: bool = True
+
+            def __init__(self, one: int, two: int):
+                self.total: int = one + two
+
+    with pytest.raises(TypeError):
+        class DirectKeywordsModel(metaclass=Immutable):
+            direct_construction: bool = True
+
+            def __init__(self, **fields):
+                for name, value in fields.items():
+                    setattr(self, name, value)
+
+
+def test_direct_construction_is_not_inherited():
+    class NormalisingModel(DirectModel):
+        def __init__(self, property_one: str, property_two: int = 2):
+            super().__init__(property_one.upper(), property_two)
+
+    model = NormalisingModel(property_one="a")
+    assert Immutable.__mutate__(model, "property_two", 3).property_one == "A"
+    with pytest.raises(TypeError):
+        NormalisingModel.__from_fields__({"property_one": "a"})
+
+
+def test_mutate_constructs_directly_when_allowed(monkeypatch):
+    model = DirectModel(property_one="A", property_two=1)
+    private_model = DirectSlottedPrivateModel(property_one=1)
+
+    def fail(self, *args, **kwargs):
+        raise AssertionError("__init__ should not be called")
+
+    monkeypatch.setattr(DirectModel, "__init__", fail)
+    monkeypatch.setattr(DirectSlottedPrivateModel, "__init__", fail)
+    mutated = Immutable.__mutate__(model, "property_two", 3)
+    assert (model.property_two, mutated.property_two) == (1, 3)
+    with pytest.raises(AttributeError):
+        mutated.property_two = 4
+    mutated_private = Immutable.__mutate__(private_model, "_property_one", 2, True)
+    assert mutated_private._property_one == 2
+
+
+def test_mutate_all_shares_unchanged_attributes_of_direct_construction_objects():
+    shared = ["not", "copied"]
+    model = DirectModel(property_one=shared, property_two=1)
+    mutated = Immutable.__mutate_all__(model, {"property_two": 2})
+    assert mutated.property_one is shared
+    assert (model.property_two, mutated.property_two) == (1, 2)
+    with pytest.raises(AttributeError):
+        mutated.property_two = 3
+    slotted = DirectSlottedPrivateModel(property_one=1)
+    assert Immutable.__mutate_all__(slotted, {"_property_one": 2}, True)._property_one == 2
+    with pytest.raises(TypeError):
+        Immutable.__mutate_all__(model, {"property_three": 3})
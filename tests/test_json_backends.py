@@ -0,0 +1,35 @@
+import pytest
+
+from eventz.json_backends import (
+    OrjsonBackend,
+    StdlibJsonBackend,
+    best_available_json_backend,
+    orjson,
+)
+
+data = {"b": [1, 2.5, None, True], "a": {"nested": "value"}}
+canonical = '{"a":{"nested":"value"},"b":[1,2.5,null,true]}'
+
+
+def test_stdlib_backend_writes_compact_sorted_documents():
+    backend = StdlibJsonBackend()
+    assert backend.dumps(data) == canonical
+    assert backend.dumps_bytes(data) == canonical.encode("utf-8")
+    assert backend.dumps(data, sort_keys=False).startswith('{"b":')
+    assert backend.loads(canonical) == data
+    assert backend.loads(canonical.encode("utf-8")) == data
+
+
+@pytest.mark.skipif(orjson is None, reason="orjson is not installed")
+def test_orjson_backend_matches_the_stdlib_backend_for_ascii_data():
+    backend = OrjsonBackend()
+    assert backend.dumps(data) == canonical
+    assert backend.dumps_bytes(data) == canonical.encode("utf-8")
+    assert backend.dumps(data, sort_keys=False).startswith('{"b":')
+    assert backend.loads(canonical) == data
+    assert backend.loads(canonical.encode("utf-8")) == data
+
+
+def test_best_available_backend_prefers_orjson():
+    expected = StdlibJsonBackend if orjson is None else OrjsonBackend
+    assert isinstance(best_available_json_backend(), expected)
@@ -0,0 +1,50 @@
+import io
+import json
+
+import pytest
+
+from eventz.json_stream import iter_json_values
+
+values = [{"name": "één", "numbers": [1, 2.5]}, 123, "text", None, [], {}]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 7, 65536])
+def test_array_items_are_yielded_one_at_a_time(chunk_size):
+    text = json.dumps(values, ensure_ascii=False, indent=2)
+    for stream in (io.StringIO(text), io.BytesIO(text.encode("utf-8"))):
+        assert list(iter_json_values(stream, chunk_size)) == values
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 65536])
+def test_json_lines_are_yielded_one_at_a_time(chunk_size):
+    text = "\n".join(json.dumps(v) for v in values) + "\n"
+    assert list(iter_json_values(io.StringIO(text), chunk_size)) == values
+
+
+def test_numbers_split_across_chunks_are_read_whole():
+    assert list(iter_json_values(io.StringIO("12345 678"), 2)) == [12345, 678]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 4, 5])
+def test_floats_split_across_chunks_are_read_whole(chunk_size):
+    text = "[1.5, 10.5e3, 1e5, -2.5E-3]"
+    values = [1.5, 10.5e3, 1e5, -2.5e-3]
+    assert list(iter_json_values(io.StringIO(text), chunk_size)) == values
+
+
+def test_items_are_read_lazily():
+    stream = io.StringIO('[{"a": 1}, ' + " " * 1000 + '{"b": 2}]')
+    items = iter_json_values(stream, 16)
+    assert next(items) == {"a": 1}
+    assert stream.tell() < 100
+
+
+@pytest.mark.parametrize("text", ["", "[]", "  [ ]  "])
+def test_empty_input(text):
+    assert list(iter_json_values(io.StringIO(text))) == []
+
+
+@pytest.mark.parametrize("text", ["[1, 2", "[1 2]", "[1, 2] 3", '{"a": ', "[1,]"])
+def test_malformed_input_raises(text):
+    with pytest.raises(json.JSONDecodeError):
+        list(iter_json_values(io.StringIO(text), 2))
@@ -1,3 +1,4 @@
+import io
 import json
 from datetime import datetime, timezone
 from enum import Enum
@@ -9,6 +10,7 @@ import stringcase
 
 from eventz.marshall import Marshall, FqnResolver, transform_keys
 from eventz.codecs.datetime import Datetime
+from eventz.json_backends import best_available_json_backend
 from eventz.packets import Packet
 from eventz.value_object import ValueObject
 
@@ -72,6 +74,14 @@ class MappingEntity(ValueObject):
         self.mapping = mapping
 
 
+class DirectEntity(ValueObject):
+    direct_construction: bool = True
+
+    def __init__(self, name: str, numbers: List[int]):
+        self.name: str = name
+        self.numbers: List[int] = numbers
+
+
 numbers1 = [1, 2, 3, 4, 5]
 numbers2 = [2, 3, 4, 5, 6]
 numbers3 = [3, 4, 5, 6, 7]
@@ -103,6 +113,21 @@ def test_fqn_map_resolution():
     assert resolver.fqn_to_type("tests.ValueType") == ValueType
 
 
+def test_fqn_resolutions_are_cached(monkeypatch):
+    entity1 = SimpleTypeEntity(name="Event One", numbers=numbers1)
+    resolver = FqnResolver(fqn_map={"tests.*": "tests.test_marshall.*"})
+    lookups = []
+    lookup_fqn = resolver._lookup_fqn
+    monkeypatch.setattr(
+        resolver, "_lookup_fqn", lambda *args: lookups.append(args) or lookup_fqn(*args)
+    )
+    for _ in range(3):
+        assert resolver.instance_to_fqn(entity1) == "tests.SimpleTypeEntity"
+        assert resolver.fqn_to_type("tests.SimpleTypeEntity") == SimpleTypeEntity
+    # an exact miss then the wildcard, once in each direction
+    assert len(lookups) == 4
+
+
 def test_single_message_serialisation_to_json():
     entity1 = SimpleTypeEntity(name="Event One", numbers=numbers1)
     assert marshall.to_json(entity1) == (
@@ -264,6 +289,20 @@ def test_entity_with_custom_datetime_codec_deserialised_from_json():
     )
 
 
+def test_datetime_codec_parses_its_own_format_and_falls_back_for_others():
+    codec = Datetime()
+    expected = datetime(2020, 1, 2, 3, 4, 5, 123000, tzinfo=timezone.utc)
+    for timestamp in (
+        "2020-01-02T03:04:05.123Z",
+        "2020-01-02T03:04:05.123000Z",
+        "2020-01-02T04:04:05.123+01:00",
+    ):
+        assert codec.deserialise({"timestamp": timestamp}, marshall) == expected
+    # datetimes read back on the fast path serialise to the same string
+    round_tripped = codec.deserialise(codec.serialise(expected, marshall)["params"], marshall)
+    assert codec.serialise(round_tripped, marshall) == codec.serialise(expected, marshall)
+
+
 def test_json_serialisable_class_to_json():
     value = 123
     entity = JsonSerialisableEntity(public=value)
@@ -340,6 +379,24 @@ def test_serialising_to_camel_case():
     )
 
 
+def test_encode_data_matches_serialising_then_transforming_keys():
+    mapping = immutables.Map(
+        {
+            "snake_key": [LongNamedEntity(one_two_three="Value")],
+            "nested_map": {"__preserve_keys__": True, "keep_me": 1},
+            "created_at": datetime(2020, 1, 2, 3, 4, 5, tzinfo=timezone.utc),
+            "__dunder_key": None,
+        }
+    )
+    entity = CustomTypeEntity(
+        name="Entity", timestamp=datetime(2020, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+    )
+    for data in (mapping, entity):
+        assert marshall.encode_data(data) == marshall.transform_keys_serialisation(
+            marshall.serialise_data(data)
+        )
+
+
 def test_serialising_to_snake_case():
     json_string =  (
         "{"
@@ -404,3 +461,150 @@ def _make_mapping_entity(name1, name2):
         "__fqn__": "tests.MappingEntity",
         "mapping": {"one": 1, "two": 2,},
     }
+
+
+class CountingDatetime(Datetime):
+    def __init__(self):
+        self.handles_called = 0
+
+    def handles(self, obj) -> bool:
+        self.handles_called += 1
+        return super().handles(obj)
+
+
+def test_codec_lookup_is_cached_per_type():
+    codec = CountingDatetime()
+    counting_marshall = Marshall(fqn_resolver=resolver, codecs={"codecs.eventz.Datetime": codec})
+    entities = [
+        CustomTypeEntity(name=f"Entity {i}", timestamp=datetime(2020, 1, 2, 3, 4, 5))
+        for i in range(10)
+    ]
+    counting_marshall.to_json(entities)
+    # one call each for list, CustomTypeEntity and datetime, and one for each
+    # of the builtin types (str, int, float, bool, None) tested for passthrough
+    assert codec.handles_called == 8
+    # (de)registering a codec invalidates the cache
+    counting_marshall.deregister_codec("codecs.eventz.Datetime")
+    counting_marshall.register_codec("codecs.eventz.Datetime", codec)
+    codec.handles_called = 0
+    assert '"__codec__":"codecs.eventz.Datetime"' in counting_marshall.to_json(entities)
+    assert codec.handles_called == 8
+
+
+def test_serialisation_plan_is_compiled_once_per_class():
+    entities = [
+        CustomTypeEntity(name=f"Entity {i}", timestamp=datetime(2020, 1, 2, 3, 4, 5, tzinfo=timezone.utc))
+        for i in range(3)
+    ]
+    plan_marshall = Marshall(fqn_resolver=resolver, codecs={"codecs.eventz.Datetime": Datetime()})
+    json_string = plan_marshall.to_json(entities)
+    assert list(plan_marshall._serialisation_plans) == [CustomTypeEntity]
+    plan = plan_marshall._serialisation_plans[CustomTypeEntity]
+    assert plan.fqn == "tests.CustomTypeEntity"
+    assert plan_marshall.from_json(json_string) == entities
+
+
+def test_key_case_conversions_are_cached():
+    entity = LongNamedEntity(one_two_three="Value")
+    cached_marshall = Marshall(fqn_resolver=resolver, key_cache_size=16)
+    for _ in range(3):
+        json_string = cached_marshall.to_json(entity)
+        assert cached_marshall.from_json(json_string) == entity
+    info = cached_marshall.key_cache_info()
+    assert (info["deserialisation"].hits, info["deserialisation"].misses) == (2, 1)
+    uncached_marshall = Marshall(fqn_resolver=resolver, key_cache_size=0)
+    for _ in range(3):
+        assert uncached_marshall.from_json(json_string) == entity
+    assert uncached_marshall.key_cache_info()["deserialisation"].misses == 3
+
+
+def test_deserialisation_plan_is_compiled_once_per_fqn():
+    plan_marshall = Marshall(fqn_resolver=resolver)
+    entities = [
+        SimpleTypeEntity(name=f"Event {i}", numbers=numbers1) for i in range(3)
+    ]
+    json_data = json.loads(plan_marshall.to_json(entities))
+    # unknown dunders are not passed to the constructor
+    json_data[0]["__version__"] = 2
+    assert plan_marshall.from_json(json.dumps(json_data)) == entities
+    assert list(plan_marshall._deserialisation_plans) == ["tests.SimpleTypeEntity"]
+    plan = plan_marshall._deserialisation_plans["tests.SimpleTypeEntity"]
+    assert plan.class_ is SimpleTypeEntity
+    assert plan.keys == {"__fqn__": None, "__version__": None, "name": True, "numbers": True}
+
+
+def test_json_backend_options():
+    entity = SimpleTypeEntity(name="Event One", numbers=numbers1)
+    unsorted_marshall = Marshall(
+        fqn_resolver=resolver, json_backend=best_available_json_backend(), sort_keys=False
+    )
+    json_bytes = unsorted_marshall.to_json_bytes(entity)
+    assert isinstance(json_bytes, bytes)
+    assert json.loads(json_bytes) == json.loads(marshall.to_json(entity))
+    assert unsorted_marshall.from_json(json_bytes) == entity
+    assert marshall.from_json(json_bytes) == entity
+
+
+def test_binary_round_trip():
+    entities = [
+        SimpleTypeEntity(name="Event One", numbers=numbers1),
+        CustomTypeEntity(
+            name="Entity", timestamp=datetime(2020, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+        ),
+    ]
+    binary_marshall = Marshall(
+        fqn_resolver=resolver, codecs={"codecs.eventz.Datetime": Datetime()}
+    )
+    document = binary_marshall.to_binary(entities)
+    assert binary_marshall.from_binary(document) == entities
+    assert len(document) < len(binary_marshall.to_json_bytes(entities))
+
+
+def test_iter_json_yields_deserialised_items():
+    entities = [SimpleTypeEntity(name=f"Event {i}", numbers=numbers1) for i in range(3)]
+    stream = io.BytesIO(marshall.to_json_bytes(entities))
+    items = marshall.iter_json(stream, chunk_size=16)
+    assert next(items) == entities[0]
+    assert list(items) == entities[1:]
+
+
+def test_iter_json_skips_items_without_deserialising_them(monkeypatch):
+    entities = [SimpleTypeEntity(name=f"Event {i}", numbers=numbers1) for i in range(3)]
+    stream = io.BytesIO(marshall.to_json_bytes(entities))
+    deserialised = []
+    deserialise_data = marshall.deserialise_data
+
+    def recording_deserialise_data(data):
+        deserialised.append(data)
+        return deserialise_data(data)
+
+    monkeypatch.setattr(marshall, "deserialise_data", recording_deserialise_data)
+    assert list(marshall.iter_json(stream, skip=2)) == entities[2:]
+    names = [d["name"] for d in deserialised if isinstance(d, dict) and "name" in d]
+    assert names == ["Event 2"]
+
+
+def test_batches_of_messages_are_marshalled_in_one_call():
+    entities = [SimpleTypeEntity(name=f"Event {i}", numbers=numbers1) for i in range(3)]
+    as_array = marshall.to_json_many(entities)
+    assert as_array == marshall.to_json(entities)
+    as_lines = marshall.to_json_many(entities, lines=True)
+    assert as_lines.splitlines() == [marshall.to_json(e) for e in entities]
+    assert as_lines.endswith("\n")
+    assert marshall.to_json_many_bytes(entities, lines=True) == as_lines.encode("utf-8")
+    for json_string in (as_array, as_lines, as_lines.encode("utf-8"), "  " + as_array):
+        assert marshall.from_json_many(json_string) == tuple(entities)
+    assert marshall.to_json_many([]) == "[]"
+    assert marshall.to_json_many([], lines=True) == ""
+    assert marshall.from_json_many("") == ()
+
+
+def test_direct_construction_classes_are_decoded_without_init(monkeypatch):
+    entities = [DirectEntity(name=f"Event {i}", numbers=numbers1) for i in range(3)]
+    json_string = marshall.to_json(entities)
+
+    def fail(self, name, numbers):
+        raise AssertionError("__init__ should not be called")
+
+    monkeypatch.setattr(DirectEntity, "__init__", fail)
+    assert marshall.from_json(json_string) == entities
@@ -39,3 +39,13 @@ def test_a_message_must_always_have_a_schema_version_set_on_the_class():
         assert NoVersion(aggregate_id=Aggregate.make_id())
     example_event_message = Example(aggregate_id=Aggregate.make_id())
     assert example_event_message.__version__ == 1
+
+
+def test_role_options_subclasses_need_not_keep_to_direct_construction():
+    class NormalisedRoleOptions(RoleOptions):
+        def __init__(self, role_name, agents, allowed_actions, note: str = ""):
+            super().__init__(role_name, tuple(agents), tuple(allowed_actions))
+            self.note: str = note
+
+    options = NormalisedRoleOptions("Dealer", ["1"], ["Deal"])
+    assert (options.agents, options.note) == (("1",), "")
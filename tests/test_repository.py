@@ -1,5 +1,10 @@
+import pytest
+
+from eventz.aggregate_cache import AggregateCache
 from eventz.dummy_storage import DummyStorage
+from eventz.errors import ConcurrencyConflictError
 from eventz.repository import Repository
+from eventz.snapshot_store_memory import SnapshotStoreMemory
 from tests.conftest import parent_id1
 from tests.example.example_aggregate import ExampleAggregate
 from tests.example.example_builder import ExampleBuilder
@@ -30,3 +35,153 @@ def test_fetch_all_events(parent_created_event, child_chosen_event):
     assert events[0].__seq__ == 1
     assert events[1].__seq__ == 2
     assert events == (parent_created_event.sequence(1), child_chosen_event.sequence(2),)
+
+
+def test_read_builds_from_the_latest_snapshot():
+    storage = DummyStorage()
+    snapshot_store = SnapshotStoreMemory()
+    repository = Repository(
+        aggregate_class=ExampleAggregate,
+        storage=storage,
+        builder=ExampleBuilder(),
+        snapshot_store=snapshot_store,
+    )
+    events = repository.create(param_one=123, param_two="abc")
+    aggregate_id = events[0].aggregate_id
+    snapshot_aggregate, seq = repository.snapshot(aggregate_id)
+    assert seq == 1
+    assert snapshot_store.fetch(aggregate_id).aggregate == snapshot_aggregate
+    aggregate, seq = repository.read(aggregate_id)
+    assert (aggregate, seq) == (snapshot_aggregate, 1)
+    # events persisted after the snapshot are applied on top of it
+    repository.persist(aggregate_id, snapshot_aggregate.update(param_one=321, param_two="cba"))
+    aggregate, seq = repository.read(aggregate_id)
+    assert seq == 2
+    assert aggregate.param_one == 321
+    assert aggregate.param_two == "cba"
+    assert snapshot_store.fetch(aggregate_id).aggregate.param_one == 123
+
+
+def test_read_only_fetches_events_after_the_snapshot():
+    storage = DummyStorage()
+    builder = ExampleBuilder()
+    repository = Repository(
+        aggregate_class=ExampleAggregate,
+        storage=storage,
+        builder=builder,
+        snapshot_store=SnapshotStoreMemory(),
+    )
+    events = repository.create(param_one=123, param_two="abc")
+    aggregate_id = events[0].aggregate_id
+    aggregate, _ = repository.snapshot(aggregate_id)
+    repository.persist(aggregate_id, aggregate.update(param_one=1, param_two="a"))
+    storage.persisted_events[aggregate_id][0] = None  # would break a full rebuild
+    aggregate, seq = repository.read(aggregate_id)
+    assert (aggregate.param_one, seq) == (1, 2)
+
+
+def test_read_through_cache_only_fetches_new_events():
+    storage = DummyStorage()
+    cache = AggregateCache()
+    repository = Repository(
+        aggregate_class=ExampleAggregate,
+        storage=storage,
+        builder=ExampleBuilder(),
+        aggregate_cache=cache,
+    )
+    aggregate_id = repository.create(param_one=123, param_two="abc")[0].aggregate_id
+    assert cache.get(aggregate_id) is None
+    aggregate, seq = repository.read(aggregate_id)
+    assert cache.get(aggregate_id) == (aggregate, 1)
+    # persisting advances the cached build in place
+    repository.persist(aggregate_id, aggregate.update(param_one=321, param_two="cba"))
+    cached, seq = cache.get(aggregate_id)
+    assert (cached.param_one, seq) == (321, 2)
+    storage.persisted_events[aggregate_id][0] = None  # would break a full rebuild
+    assert repository.read(aggregate_id) == (cached, 2)
+    # events persisted elsewhere are caught up on the next read
+    storage.persist(aggregate_id, aggregate.update(param_one=7, param_two="x"))
+    aggregate, seq = repository.read(aggregate_id)
+    assert (aggregate.param_one, seq) == (7, 3)
+
+
+def test_cache_hits_without_new_events_are_not_put_again():
+    puts = []
+
+    class RecordingCache(AggregateCache):
+        def put(self, aggregate_id, aggregate, seq):
+            puts.append(seq)
+            super().put(aggregate_id, aggregate, seq)
+
+    repository = Repository(
+        aggregate_class=ExampleAggregate,
+        storage=DummyStorage(),
+        builder=ExampleBuilder(),
+        aggregate_cache=RecordingCache(),
+    )
+    aggregate_id = repository.create(param_one=123, param_two="abc")[0].aggregate_id
+    repository.read(aggregate_id)
+    repository.read(aggregate_id)
+    repository.read(aggregate_id)
+    assert puts == [1]
+
+
+def test_a_failing_cache_update_does_not_fail_the_persist():
+    class FailingBuilder(ExampleBuilder):
+        def update(self, aggregate, events):
+            raise ValueError("cannot apply")
+
+    storage = DummyStorage()
+    cache = AggregateCache()
+    repository = Repository(
+        aggregate_class=ExampleAggregate,
+        storage=storage,
+        builder=ExampleBuilder(),
+        aggregate_cache=cache,
+    )
+    aggregate_id = repository.create(param_one=123, param_two="abc")[0].aggregate_id
+    aggregate, _ = repository.read(aggregate_id)
+    repository._builder = FailingBuilder()
+    events = repository.persist(aggregate_id, aggregate.update(param_one=1, param_two="a"))
+    assert events[0].__seq__ == 2
+    assert cache.get(aggregate_id) is None
+    assert len(storage.fetch(aggregate_id)) == 2
+
+
+def test_read_folds_events_as_the_store_yields_them():
+    yielded = []
+
+    class StreamingStorage(DummyStorage):
+        def fetch(self, aggregate_id, seq=None):
+            raise AssertionError("read should stream the events")
+
+        def iter_events(self, aggregate_id, seq=None):
+            for event in super().fetch(aggregate_id, seq):
+                yielded.append(event.__seq__)
+                yield event
+
+    repository = Repository(
+        aggregate_class=ExampleAggregate,
+        storage=StreamingStorage(),
+        builder=ExampleBuilder(),
+    )
+    aggregate_id = repository.create(param_one=123, param_two="abc")[0].aggregate_id
+    aggregate, _ = repository.read(aggregate_id)
+    repository.persist(aggregate_id, aggregate.update(param_one=1, param_two="a"))
+    aggregate, seq = repository.read(aggregate_id)
+    assert (aggregate.param_one, seq) == (1, 2)
+    assert yielded == [1, 1, 2]
+
+
+def test_persist_with_a_stale_expected_seq_is_a_conflict():
+    repository = Repository(
+        aggregate_class=ExampleAggregate, storage=DummyStorage(), builder=ExampleBuilder(),
+    )
+    aggregate_id = repository.create(param_one=123, param_two="abc")[0].aggregate_id
+    aggregate, seq = repository.read(aggregate_id)
+    repository.persist(aggregate_id, aggregate.update(param_one=1, param_two="a"), seq)
+    with pytest.raises(ConcurrencyConflictError):
+        repository.persist(aggregate_id, aggregate.update(param_one=2, param_two="b"), seq)
+    with pytest.raises(ConcurrencyConflictError):
+        repository.create(uuid=aggregate_id, param_one=123, param_two="abc")
+    assert repository.read(aggregate_id)[1] == 2
@@ -7,6 +7,7 @@ from eventz.events import SnapshotEvent
 from eventz.marshall import FqnResolver, Marshall
 from eventz.packets import Packet
 from eventz.repository import Repository
+from eventz.snapshot_store_memory import SnapshotStoreMemory
 from tests.example.commands import CreateExample, UpdateExample
 from tests.example.example_aggregate import (
     ExampleCreated,
@@ -139,6 +140,26 @@ def test_service_processes_snapshot_command():
     assert len(storage.persisted_events[example_id]) == 2
 
 
+def test_service_snapshot_command_persists_the_snapshot():
+    storage = DummyStorage()
+    storage.persist(
+        aggregate_id=example_id, events=(example_created_event, example_updated_event)
+    )
+    snapshot_store = SnapshotStoreMemory()
+    repository = Repository(
+        aggregate_class=ExampleAggregate,
+        storage=storage,
+        builder=ExampleBuilder(),
+        snapshot_store=snapshot_store,
+    )
+    marshall = Marshall(fqn_resolver=FqnResolver(fqn_map={}))
+    service = ExampleService(marshall=marshall, repository=repository)
+    service.process(SnapshotCommand(aggregate_id=example_id))
+    snapshot = snapshot_store.fetch(example_id)
+    assert snapshot.seq == 2
+    assert snapshot.aggregate.param_one == 321
+
+
 def test_domain_command_from_packet():
     aggregate_id = Aggregate.make_id()
     dialog_id = Aggregate.make_id()
@@ -0,0 +1,120 @@
+import pytest
+
+from eventz.dummy_storage import DummyStorage
+from eventz.repository import Repository
+from eventz.snapshot_policies import EveryNEvents, EveryTSeconds, RebuildTimeExceeds
+from eventz.snapshot_scheduler import SnapshotScheduler
+from eventz.snapshot_store_memory import SnapshotStoreMemory
+from eventz.snapshots import SnapshotStats
+from tests.example.example_aggregate import ExampleAggregate
+from tests.example.example_builder import ExampleBuilder
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _stats(events: int = 0, seconds: float = 0.0, rebuild_ms=None) -> SnapshotStats:
+    return SnapshotStats(
+        aggregate_id="a",
+        events_since_snapshot=events,
+        seconds_since_snapshot=seconds,
+        last_rebuild_ms=rebuild_ms,
+    )
+
+
+def test_policies():
+    assert EveryNEvents(3).should_snapshot(_stats(events=3)) is True
+    assert EveryNEvents(3).should_snapshot(_stats(events=2)) is False
+    assert EveryTSeconds(10).should_snapshot(_stats(events=1, seconds=10)) is True
+    assert EveryTSeconds(10).should_snapshot(_stats(events=0, seconds=10)) is False
+    assert EveryTSeconds(10).should_snapshot(_stats(events=1, seconds=9)) is False
+    assert RebuildTimeExceeds(5).should_snapshot(_stats(events=1, rebuild_ms=6)) is True
+    assert RebuildTimeExceeds(5).should_snapshot(_stats(events=1, rebuild_ms=4)) is False
+    assert RebuildTimeExceeds(5).should_snapshot(_stats(events=1)) is False
+
+
+def test_snapshot_is_taken_in_the_background_every_n_events():
+    snapshot_store = SnapshotStoreMemory()
+    scheduler = SnapshotScheduler(policies=(EveryNEvents(3),))
+    repository = Repository(
+        aggregate_class=ExampleAggregate,
+        storage=DummyStorage(),
+        builder=ExampleBuilder(),
+        snapshot_store=snapshot_store,
+        snapshot_scheduler=scheduler,
+    )
+    aggregate_id = repository.create(param_one=0, param_two="abc")[0].aggregate_id
+    aggregate, _ = repository.read(aggregate_id)
+    repository.persist(aggregate_id, aggregate.update(param_one=1, param_two="abc"))
+    scheduler.flush()
+    assert snapshot_store.fetch(aggregate_id) is None
+    repository.persist(aggregate_id, aggregate.update(param_one=2, param_two="abc"))
+    scheduler.flush()
+    assert snapshot_store.fetch(aggregate_id).seq == 3
+    assert snapshot_store.fetch(aggregate_id).aggregate.param_one == 2
+    assert scheduler.get_stats(aggregate_id).events_since_snapshot == 0
+    scheduler.stop()
+
+
+def test_time_and_rebuild_policies_are_evaluated_after_persist():
+    clock = FakeClock()
+    snapshots = []
+    scheduler = SnapshotScheduler(
+        policies=(EveryTSeconds(60), RebuildTimeExceeds(50)), clock=clock
+    )
+    scheduler.start(snapshots.append)
+    scheduler.persisted("a", 1)
+    scheduler.flush()
+    assert snapshots == []
+    clock.now = 61.0
+    scheduler.persisted("a", 2)
+    scheduler.flush()
+    assert snapshots == ["a"]
+    scheduler.snapshot_taken("a", 2)
+    scheduler.rebuilt("a", 51.0)
+    scheduler.persisted("a", 3)
+    scheduler.flush()
+    assert snapshots == ["a", "a"]
+    scheduler.stop()
+
+
+def test_failing_snapshot_does_not_stop_the_worker():
+    calls = []
+
+    def snapshotter(aggregate_id):
+        calls.append(aggregate_id)
+        raise RuntimeError("storage unavailable")
+
+    scheduler = SnapshotScheduler(policies=(EveryNEvents(1),))
+    scheduler.start(snapshotter)
+    scheduler.persisted("a", 1)
+    scheduler.flush()
+    scheduler.persisted("a", 2)
+    scheduler.flush()
+    assert calls == ["a", "a"]
+    scheduler.stop()
+
+
+def test_a_scheduler_serves_a_single_repository():
+    scheduler = SnapshotScheduler(policies=(EveryNEvents(1),))
+    scheduler.start(lambda aggregate_id: None)
+    with pytest.raises(RuntimeError):
+        scheduler.start(lambda aggregate_id: None)
+    scheduler.stop()
+    scheduler.start(lambda aggregate_id: None)
+    scheduler.stop()
+
+
+def test_only_the_most_recently_active_aggregates_are_tracked():
+    scheduler = SnapshotScheduler(policies=(EveryNEvents(100),), max_aggregates=2)
+    scheduler.persisted("a", 5)
+    scheduler.persisted("b", 5)
+    scheduler.persisted("a", 6)
+    scheduler.persisted("c", 5)
+    assert list(scheduler._states) == ["a", "c"]
+    assert scheduler.get_stats("a").events_since_snapshot == 6
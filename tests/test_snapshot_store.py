@@ -0,0 +1,89 @@
+from threading import Thread
+
+import pytest
+
+from eventz.aggregate import Aggregate
+from eventz.marshall import FqnResolver, Marshall
+from eventz.snapshot_store_json_file import SnapshotStoreJsonFile
+from eventz.snapshot_store_memory import SnapshotStoreMemory
+from eventz.snapshot_store_sqlite import SnapshotStoreSqlite
+from eventz.snapshots import Snapshot
+from tests.example.example_aggregate import ExampleAggregate
+
+marshall = Marshall(
+    fqn_resolver=FqnResolver(
+        fqn_map={"tests.ExampleAggregate": "tests.example.example_aggregate.ExampleAggregate"}
+    ),
+)
+aggregate_id = Aggregate.make_id()
+
+
+@pytest.fixture(params=["memory", "json_file", "sqlite"])
+def snapshot_store(request, tmp_path):
+    if request.param == "memory":
+        return SnapshotStoreMemory()
+    if request.param == "json_file":
+        return SnapshotStoreJsonFile(
+            storage_path=str(tmp_path), marshall=marshall, recreate_storage=True,
+        )
+    return SnapshotStoreSqlite(database_path=":memory:", marshall=marshall)
+
+
+def test_missing_snapshot_is_none(snapshot_store):
+    assert snapshot_store.fetch(aggregate_id) is None
+
+
+def test_snapshot_can_be_persisted_and_fetched(snapshot_store):
+    aggregate = ExampleAggregate(uuid=aggregate_id, param_one=123, param_two="abc")
+    snapshot_store.persist(Snapshot(aggregate_id=aggregate_id, seq=5, aggregate=aggregate))
+    snapshot = snapshot_store.fetch(aggregate_id)
+    assert snapshot == Snapshot(aggregate_id=aggregate_id, seq=5, aggregate=aggregate)
+
+
+def test_only_the_latest_snapshot_is_kept(snapshot_store):
+    old = ExampleAggregate(uuid=aggregate_id, param_one=1, param_two="old")
+    new = ExampleAggregate(uuid=aggregate_id, param_one=2, param_two="new")
+    snapshot_store.persist(Snapshot(aggregate_id=aggregate_id, seq=2, aggregate=old))
+    snapshot_store.persist(Snapshot(aggregate_id=aggregate_id, seq=7, aggregate=new))
+    snapshot_store.persist(Snapshot(aggregate_id=aggregate_id, seq=4, aggregate=old))
+    snapshot = snapshot_store.fetch(aggregate_id)
+    assert snapshot.seq == 7
+    assert snapshot.aggregate == new
+
+
+def test_json_file_store_compares_seq_without_decoding_the_aggregate(
+    tmp_path, monkeypatch
+):
+    store = SnapshotStoreJsonFile(
+        storage_path=str(tmp_path), marshall=marshall, recreate_storage=True,
+    )
+    aggregate = ExampleAggregate(uuid=aggregate_id, param_one=1, param_two="a")
+    store.persist(Snapshot(aggregate_id=aggregate_id, seq=3, aggregate=aggregate))
+
+    def fail(json_string):
+        raise AssertionError("persist should not decode the stored snapshot")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(marshall, "from_json", fail)
+        store.persist(Snapshot(aggregate_id=aggregate_id, seq=2, aggregate=aggregate))
+        store.persist(Snapshot(aggregate_id=aggregate_id, seq=4, aggregate=aggregate))
+    assert store.fetch(aggregate_id).seq == 4
+
+
+def test_json_file_store_keeps_the_latest_of_concurrent_snapshots(tmp_path):
+    store = SnapshotStoreJsonFile(
+        storage_path=str(tmp_path), marshall=marshall, recreate_storage=True,
+    )
+    aggregate = ExampleAggregate(uuid=aggregate_id, param_one=1, param_two="a")
+    threads = [
+        Thread(
+            target=store.persist,
+            args=(Snapshot(aggregate_id=aggregate_id, seq=seq, aggregate=aggregate),),
+        )
+        for seq in range(20, 0, -1)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert store.fetch(aggregate_id).seq == 20